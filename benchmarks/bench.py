@@ -0,0 +1,188 @@
+"""Benchmarks for the simulation and visualizer hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench run --out benchmarks/baselines/main.json
+    python -m benchmarks.bench run --out current.json
+    python -m benchmarks.bench compare benchmarks/baselines/main.json current.json
+
+Every case records the best wall time over --repeat runs (after one
+untimed warm-up run), its throughput (periods/s or frames/s) and peak
+traced memory from a separate run, since tracemalloc slows the code it
+traces. compare exits with status 1 when a
+case is slower or uses more memory than the baseline beyond --tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.animation as animation
+import matplotlib.pyplot as plt
+import numpy as np
+
+from src.layout import DEFAULT_LAYOUT, StorageLayout
+from src.simulation import sim_fifo_single, simFIFO
+from src.visualizer import sim_fifo_single_visual
+
+LAYOUTS = {
+    'default': DEFAULT_LAYOUT,
+    'wide64': StorageLayout([10] * 64),
+}
+
+FULL_HORIZONS = (100, 1000, 10000)
+FULL_REPLICATIONS = ((100, 100), (1000, 100), (100, 1000))
+FULL_FRAMES = (50, 200)
+QUICK_HORIZONS = (100, 1000)
+QUICK_REPLICATIONS = ((20, 100),)
+QUICK_FRAMES = (20,)
+
+
+class DrawOnlyWriter(animation.AbstractMovieWriter):
+    """Movie writer that renders every frame on the Agg canvas and keeps nothing."""
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+
+    def grab_frame(self, **savefig_kwargs):
+        self.fig.canvas.draw()
+
+    def finish(self):
+        pass
+
+
+def run_visual(num_periods, layout):
+    sim_fifo_single_visual(num_periods=num_periods, save_movie=False, layout=layout,
+                           writer=DrawOnlyWriter(fps=15))
+    plt.close('all')
+
+
+def cases(quick=False):
+    # Yields (name, function, units of work per call, unit)
+    horizons = QUICK_HORIZONS if quick else FULL_HORIZONS
+    replications = QUICK_REPLICATIONS if quick else FULL_REPLICATIONS
+    frames = QUICK_FRAMES if quick else FULL_FRAMES
+    for layout_name, layout in LAYOUTS.items():
+        for num_periods in horizons:
+            yield (f'sim_fifo_single/{layout_name}/p{num_periods}',
+                   lambda p=num_periods, l=layout: sim_fifo_single(num_periods=p, layout=l),
+                   num_periods, 'periods/s')
+        for num_simulations, num_periods in replications:
+            for vectorized in (False, True):
+                mode = 'vectorized' if vectorized else 'loop'
+                yield (f'simFIFO-{mode}/{layout_name}/n{num_simulations}p{num_periods}',
+                       lambda n=num_simulations, p=num_periods, l=layout, v=vectorized: simFIFO(
+                           num_simulations=n, num_periods=p, vectorized=v, layout=l),
+                       num_simulations * num_periods, 'periods/s')
+    for num_periods in frames:
+        yield (f'sim_fifo_single_visual/default/f{num_periods}',
+               lambda p=num_periods: run_visual(p, DEFAULT_LAYOUT),
+               num_periods, 'frames/s')
+
+
+def measure(func, work, repeat):
+    # Untimed warm-up so lazy imports and first-call caches are not charged to the case
+    np.random.seed(0)
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        np.random.seed(0)
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    np.random.seed(0)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': best, 'throughput': work / best, 'peak_bytes': peak}
+
+
+def run(args):
+    results = {}
+    for name, func, work, unit in cases(args.quick):
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(func, work, args.repeat)
+        result['unit'] = unit
+        results[name] = result
+        print(f"{name:50s} {result['throughput']:12.1f} {unit:10s} "
+              f"{result['peak_bytes'] / 2**20:8.1f} MiB", flush=True)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        return compare_reports(load(args.baseline), report, args.tolerance)
+    return 0
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, tolerance=0.1):
+    """Print per-case ratios against the baseline; returns 1 if anything regressed."""
+    regressions = 0
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            print(f"{name:50s} (no baseline)")
+            continue
+        base = baseline['results'][name]
+        speed = result['throughput'] / base['throughput']
+        memory = result['peak_bytes'] / max(base['peak_bytes'], 1)
+        flags = []
+        if speed < 1 - tolerance:
+            flags.append('SLOWER')
+        if memory > 1 + tolerance:
+            flags.append('MORE MEMORY')
+        regressions += bool(flags)
+        print(f"{name:50s} speed x{speed:6.2f}  memory x{memory:6.2f}  {' '.join(flags)}")
+    if regressions:
+        print(f"{regressions} regression(s) beyond {tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmark matrix')
+    run_parser.add_argument('--out', help='write results to this JSON file')
+    run_parser.add_argument('--baseline', help='compare against this JSON baseline')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--tolerance', type=float, default=0.1)
+    run_parser.add_argument('--quick', action='store_true', help='small matrix for smoke runs')
+    run_parser.add_argument('--filter', help='only cases whose name contains this string')
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    return compare_reports(load(args.baseline), load(args.current), args.tolerance)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
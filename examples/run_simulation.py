@@ -9,15 +9,15 @@ def main():
     
     # Run multiple simulations
     print("\nRunning multiple simulations...")
-    results = simFIFO(num_simulations=10, num_periods=100)
+    results = simFIFO(num_simulations=10, num_periods=100, compact=True)
     
     # Plot results
     plt.figure(figsize=(12, 6))
     for sim in range(5):
-        single_sim = results[results['simulation'] == sim]
-        for area in range(1, 5):
-            plt.plot(single_sim[f'area{area}_occupancy'], 
-                    label=f'Simulation {sim} Area {area}')
+        single_sim = results.simulation(sim)
+        for area in range(4):
+            plt.plot(single_sim[:, area], 
+                    label=f'Simulation {sim} Area {area + 1}')
     plt.xlabel('Period')
     plt.ylabel('Occupancy')
     plt.legend()
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+
+class BackgroundServer:
+    """TCP server running its own asyncio loop on a daemon thread.
+
+    Subclasses provide ``async _handle(reader, writer)`` for each connection
+    and ``async _running()``, which runs once the socket is bound and
+    returns after ``self._stopping`` is set. start() returns once the server
+    listens and re-raises any error from binding (e.g. a port in use);
+    port=0 picks a free port, stored back in ``self.port``.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+        self._loop = None
+        self._stopping = None
+
+    def start(self):
+        self._started.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),), daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            self._thread.join()
+            error, self._error = self._error, None
+            raise error
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _prepare(self):
+        # Loop-bound state (queues, events) created before the first connection
+        pass
+
+    async def _main(self):
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._stopping = asyncio.Event()
+            self._prepare()
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+        except Exception as error:
+            self._error = error
+            self._loop = None
+            return
+        finally:
+            self._started.set()
+        try:
+            await self._running()
+        finally:
+            server.close()
+            await server.wait_closed()
@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.engine import occupancy_frame, simulate_chunk
+from src.layout import DEFAULT_LAYOUT
+from src.parallel import chunk_bounds
+from src.results import SimulationResults
+
+MANIFEST = 'manifest.json'
+
+
+def _write_atomic(path, write):
+    # Write through a temporary file in the same directory, then rename over path
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _global_state():
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return [name, keys.tolist(), int(pos), int(has_gauss), float(cached_gaussian)]
+
+
+def _set_global_state(state):
+    name, keys, pos, has_gauss, cached_gaussian = state
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+
+class Checkpoint:
+    """Directory of completed replication chunks plus a JSON manifest.
+
+    Each chunk is a ``chunk_<start>.npy`` occupancy array. The manifest
+    records the run configuration, the completed chunk starts and, for runs
+    on the global np.random generator, its state after the last completed
+    chunk (or before the first one). Chunk files are written before the
+    manifest that lists them, and both are replaced atomically, so a crash
+    at any point leaves a consistent checkpoint.
+    """
+
+    def __init__(self, directory, config):
+        self.directory = directory
+        self.config = config
+        self.completed = set()
+        self.rng_state = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST)
+
+    def chunk_path(self, start):
+        return os.path.join(self.directory, f'chunk_{start:012d}.npy')
+
+    def load(self):
+        """Read an existing manifest; returns False if there is none."""
+        if not os.path.exists(self.manifest_path):
+            return False
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['config'] != self.config:
+            raise ValueError(f"checkpoint in {self.directory} was written for a different run: "
+                             f"{manifest['config']}")
+        self.completed = set(manifest['completed'])
+        self.rng_state = manifest['rng_state']
+        return True
+
+    def save_state(self, rng_state):
+        self.rng_state = rng_state
+        manifest = {'config': self.config, 'completed': sorted(self.completed),
+                    'rng_state': rng_state}
+        _write_atomic(self.manifest_path, lambda f: f.write(json.dumps(manifest).encode()))
+
+    def save_chunk(self, start, occupancy, rng_state=None):
+        _write_atomic(self.chunk_path(start), lambda f: np.save(f, occupancy))
+        self.completed.add(start)
+        self.save_state(rng_state)
+
+    def load_chunk(self, start):
+        return np.load(self.chunk_path(start))
+
+
+def _global_chunk(start, stop, num_periods, layout):
+    from src.simulation import sim_fifo_single
+
+    return np.stack([sim_fifo_single(num_periods, layout=layout)[layout.columns].to_numpy()
+                     for _ in range(start, stop)])
+
+
+def sim_fifo_checkpointed(directory, num_simulations=1000, num_periods=100,
+                          checkpoint_every=1000, seed=None, n_jobs=1, layout=DEFAULT_LAYOUT,
+                          resume=True, compact=False, live=None):
+    """simFIFO with completed replications persisted every checkpoint_every replications.
+
+    With a seed, replication i uses the i-th spawned stream (as in simFIFO's
+    parallel mode), so missing chunks can be computed in any order and on
+    n_jobs processes. Without one, replications run one after another on the
+    global np.random generator, whose state is saved before the first chunk
+    and with every chunk; n_jobs > 1 then raises ValueError.
+
+    Rerunning with the same arguments and directory resumes from the
+    checkpoint; the result is identical to an uninterrupted run. Set
+    resume=False to discard an existing checkpoint. compact=True returns a
+    SimulationResults instead of the DataFrame. Progress is published to
+    ``live`` (a src.live.LiveServer) after every saved chunk.
+    """
+    if seed is None and n_jobs > 1:
+        raise ValueError("n_jobs > 1 needs a seed: unseeded checkpointed runs draw from "
+                         "the global np.random generator in order")
+    config = {
+        'num_simulations': num_simulations,
+        'num_periods': num_periods,
+        'checkpoint_every': checkpoint_every,
+        'capacities': list(layout.capacities),
+        'seed': None if seed is None else str(np.random.SeedSequence(seed).entropy),
+    }
+    checkpoint = Checkpoint(directory, config)
+    if resume:
+        checkpoint.load()
+    bounds = chunk_bounds(num_simulations, checkpoint_every)
+    missing = [(start, stop) for start, stop in bounds if start not in checkpoint.completed]
+
+    metrics = None
+    if live is not None:
+        from src.live import ChunkMetrics
+        metrics = ChunkMetrics(live, num_simulations, num_periods)
+        metrics.skip(num_simulations - sum(stop - start for start, stop in missing))
+        metrics.flush()
+
+    def save(start, occupancy, rng_state=None):
+        checkpoint.save_chunk(start, occupancy, rng_state)
+        if metrics is not None:
+            metrics.add(occupancy)
+
+    if seed is None:
+        if checkpoint.rng_state is not None:
+            _set_global_state(checkpoint.rng_state)
+        else:
+            # A crash during the first chunk must resume from this state too
+            checkpoint.save_state(_global_state())
+        for start, stop in missing:
+            occupancy = _global_chunk(start, stop, num_periods, layout)
+            save(start, occupancy, _global_state())
+    elif n_jobs == 1:
+        for start, stop in missing:
+            save(start, simulate_chunk(seed, start, stop, num_periods, layout.capacities))
+    else:
+        seed = np.random.SeedSequence(seed)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            pending = {pool.submit(simulate_chunk, seed, start, stop, num_periods,
+                                   layout.capacities): start
+                       for start, stop in missing}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    save(pending.pop(future), future.result())
+
+    occupancy = np.empty((num_simulations, num_periods, len(layout)),
+                         dtype=np.min_scalar_type(max(layout.capacities)))
+    for start, stop in bounds:
+        occupancy[start:stop] = checkpoint.load_chunk(start)
+    if compact:
+        return SimulationResults(occupancy, layout.capacities)
+    return occupancy_frame(occupancy)
@@ -0,0 +1,192 @@
+import heapq
+import math
+from collections import deque
+
+import numpy as np
+
+from src.engine import ARRIVAL_MEAN, REMOVAL_MEAN
+from src.fifo import AreaFIFO
+from src.layout import DEFAULT_LAYOUT, FirstFitIndex
+
+# Where loading forklifts pick up arrivals and unloading forklifts drop retrievals
+ENTRY_POINT = (0.1, 0.8)
+EXIT_POINT = (0.1, 0.2)
+
+# Event kinds, ordered so that simultaneous events are handled deterministically
+SAMPLE, STORE, PICK, LOAD_RETURN, UNLOAD_RETURN, ARRIVAL, REQUEST = range(7)
+
+
+class _Draws:
+    # Exponential variates drawn from the generator in blocks
+    def __init__(self, rng, mean, block=4096):
+        self.rng = rng
+        self.mean = mean
+        self.block = block
+        self.values = []
+
+    def next(self):
+        if not self.values:
+            self.values = self.rng.exponential(self.mean, self.block).tolist()
+        return self.values.pop()
+
+
+class ForkliftPool:
+    """A pool of identical forklifts with a FIFO queue of waiting jobs.
+
+    Busy time is booked when a job starts, clipped to the horizon, so
+    utilization is exact even for trips still running when the run ends.
+    """
+
+    def __init__(self, size, horizon):
+        self.size = size
+        self.horizon = horizon
+        self.idle = size
+        self.queue = deque()
+        self.busy_time = 0.0
+        self.waits = []
+
+    def request(self, now):
+        """Queue a job requested at time now."""
+        self.queue.append(now)
+
+    def start(self, now, duration):
+        """Start the oldest waiting job on an idle forklift for duration periods."""
+        self.waits.append(now - self.queue.popleft())
+        self.idle -= 1
+        self.busy_time += min(now + duration, self.horizon) - now
+
+    def release(self):
+        self.idle += 1
+
+    def utilization(self):
+        return self.busy_time / (self.size * self.horizon)
+
+
+def sim_fifo_des(num_periods=100, num_loading_forklifts=4, num_unloading_forklifts=3,
+                 arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN,
+                 travel_time=0.02, service_time=0.005, layout=DEFAULT_LAYOUT, seed=None):
+    """Discrete-event simulation of the storage site with forklift contention.
+
+    Items arrive at the entry point and retrieval requests at the exit point
+    as Poisson processes (arrival_mean / removal_mean per period). Each job
+    waits for a forklift from its pool, which travels to the area
+    (travel_time periods per unit of distance to the area's ``pos``), handles
+    the item (exponential service_time) and travels back. Storage is first-fit
+    and retrieval is from the first area holding an item, as in sim_fifo_single.
+
+    Returns a dict with per-period end-of-period occupancy and rejected
+    arrivals, forklift utilization, per-job waiting times and event counts.
+    """
+    rng = np.random.default_rng(seed)
+    num_areas = len(layout)
+    fifos = [AreaFIFO(capacity) for capacity in layout.capacities]
+    # Slots counts stored plus reserved items (placement); stock counts items
+    # physically on the shelf and not yet claimed by a retrieval
+    slots = FirstFitIndex(layout.capacities)
+    stock = FirstFitIndex(layout.capacities)
+
+    load_trip = [travel_time * math.dist(ENTRY_POINT, pos) for pos in layout.positions]
+    unload_trip = [travel_time * math.dist(EXIT_POINT, pos) for pos in layout.positions]
+    interarrival = _Draws(rng, 1 / arrival_mean)
+    interrequest = _Draws(rng, 1 / removal_mean)
+    service = _Draws(rng, service_time)
+
+    loaders = ForkliftPool(num_loading_forklifts, num_periods)
+    unloaders = ForkliftPool(num_unloading_forklifts, num_periods)
+
+    occupancy = np.zeros((num_periods, num_areas), dtype=np.int64)
+    rejected = np.zeros(num_periods, dtype=np.int64)
+    counts = {'arrivals': 0, 'stored': 0, 'rejected': 0,
+              'requests': 0, 'removed': 0, 'unfulfilled': 0, 'events': 0}
+    next_item_id = 0
+
+    events = []
+    seq = 0
+
+    def schedule(time, kind, data=None):
+        nonlocal seq
+        heapq.heappush(events, (time, kind, seq, data))
+        seq += 1
+
+    def dispatch_loading(now):
+        nonlocal next_item_id
+        while loaders.queue and loaders.idle:
+            area = slots.first_free()
+            if area is None:
+                # Site is full: the waiting arrival is turned away
+                loaders.queue.popleft()
+                counts['rejected'] += 1
+                rejected[int(now)] += 1
+                continue
+            slots.move(area, 1)
+            handling = service.next()
+            loaders.start(now, 2 * load_trip[area] + handling)
+            schedule(now + load_trip[area] + handling, STORE, (area, next_item_id))
+            schedule(now + 2 * load_trip[area] + handling, LOAD_RETURN)
+            next_item_id += 1
+
+    def dispatch_unloading(now):
+        while unloaders.queue and unloaders.idle:
+            area = stock.first_occupied()
+            if area is None:
+                # Nothing retrievable: the request lapses
+                unloaders.queue.popleft()
+                counts['unfulfilled'] += 1
+                continue
+            stock.move(area, -1)
+            handling = service.next()
+            unloaders.start(now, 2 * unload_trip[area] + handling)
+            schedule(now + unload_trip[area] + handling, PICK, area)
+            schedule(now + 2 * unload_trip[area] + handling, UNLOAD_RETURN)
+
+    schedule(interarrival.next(), ARRIVAL)
+    schedule(interrequest.next(), REQUEST)
+    for period in range(num_periods):
+        schedule(period + 1, SAMPLE, period)
+
+    while events:
+        now, kind, _, data = heapq.heappop(events)
+        counts['events'] += 1
+        if kind == SAMPLE:
+            occupancy[data] = [len(fifo) for fifo in fifos]
+            if data == num_periods - 1:
+                break
+        elif kind == ARRIVAL:
+            counts['arrivals'] += 1
+            loaders.request(now)
+            dispatch_loading(now)
+            schedule(now + interarrival.next(), ARRIVAL)
+        elif kind == REQUEST:
+            counts['requests'] += 1
+            unloaders.request(now)
+            dispatch_unloading(now)
+            schedule(now + interrequest.next(), REQUEST)
+        elif kind == STORE:
+            area, item_id = data
+            fifos[area].push(int(now), item_id)
+            stock.move(area, 1)
+            counts['stored'] += 1
+            dispatch_unloading(now)
+        elif kind == PICK:
+            fifos[data].pop()
+            slots.move(data, -1)
+            counts['removed'] += 1
+            dispatch_loading(now)
+        elif kind == LOAD_RETURN:
+            loaders.release()
+            dispatch_loading(now)
+        elif kind == UNLOAD_RETURN:
+            unloaders.release()
+            dispatch_unloading(now)
+
+    return {
+        'occupancy': occupancy,
+        'rejected_per_period': rejected,
+        'loading_utilization': loaders.utilization(),
+        'unloading_utilization': unloaders.utilization(),
+        'loading_wait': np.array(loaders.waits),
+        'unloading_wait': np.array(unloaders.waits),
+        'loading_queue': len(loaders.queue),
+        'unloading_queue': len(unloaders.queue),
+        **counts
+    }
@@ -0,0 +1,298 @@
+"""Coordinator/worker execution of sweep tasks over plain TCP.
+
+Start workers on every node (they retry until the coordinator is up):
+
+    python -m src.distributed --host coordinator.local --port 8766
+
+and run the sweep on the coordinator:
+
+    with Coordinator(host='0.0.0.0', port=8766) as coordinator:
+        summary = run_sweep(grid, num_simulations=10000, coordinator=coordinator)
+
+Messages are a 12-byte length prefix, a JSON header and raw array bytes,
+so result chunks travel in their compact integer dtype. There is no
+authentication: only listen on trusted networks.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import socket
+import struct
+import sys
+import time
+import traceback
+
+import numpy as np
+
+from src.background import BackgroundServer
+from src.encoding import json_default
+
+PREFIX = struct.Struct('!IQ')
+
+
+def encode_message(header, arrays=None):
+    """Length prefix + JSON header (with array names, dtypes and shapes) + array bytes."""
+    arrays = {name: np.ascontiguousarray(a) for name, a in (arrays or {}).items()}
+    header = dict(header, arrays=[[name, a.dtype.str, list(a.shape)]
+                                  for name, a in arrays.items()])
+    blob = json.dumps(header, default=json_default).encode()
+    body = b''.join(a.tobytes() for a in arrays.values())
+    return PREFIX.pack(len(blob), len(body)) + blob + body
+
+
+def decode_message(blob, body):
+    header = json.loads(blob)
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in header.pop('arrays'):
+        dtype = np.dtype(dtype)
+        size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(body, dtype, offset=offset,
+                                     count=size // dtype.itemsize).reshape(shape)
+        offset += size
+    return header, arrays
+
+
+async def read_message(reader):
+    blob_size, body_size = PREFIX.unpack(await reader.readexactly(PREFIX.size))
+    blob = await reader.readexactly(blob_size)
+    return decode_message(blob, await reader.readexactly(body_size))
+
+
+def _read_exactly(stream, n):
+    data = stream.read(n)
+    if len(data) < n:
+        raise EOFError('connection closed')
+    return data
+
+
+def receive_message(stream):
+    blob_size, body_size = PREFIX.unpack(_read_exactly(stream, PREFIX.size))
+    blob = _read_exactly(stream, blob_size)
+    return decode_message(blob, _read_exactly(stream, body_size))
+
+
+class Coordinator(BackgroundServer):
+    """Hands out tasks to the workers connected over TCP and collects their results.
+
+    Runs an asyncio loop on a daemon thread. Each connected worker gets one
+    task at a time, so faster nodes simply take more tasks. A task whose
+    worker reports an error, drops the connection or does not answer within
+    task_timeout seconds is queued again (a timed-out worker is
+    disconnected); after max_attempts failures map() raises. map() also
+    raises when no worker is connected or the last one disconnects.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8766, task_timeout=600.0, max_attempts=3):
+        super().__init__(host, port)
+        self.task_timeout = task_timeout
+        self.max_attempts = max_attempts
+        self.num_workers = 0
+        self._ids = itertools.count()
+        self._tasks = {}
+        self._futures = {}
+        self._attempts = {}
+        self._handlers = set()
+        self._queue = None
+
+    @property
+    def address(self):
+        return self.host, self.port
+
+    def wait_for_workers(self, count, timeout=None):
+        """Block until at least count workers are connected; returns whether they are."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.num_workers < count:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def map(self, tasks, timeout=None):
+        """Run JSON-serializable task dicts on the workers; returns their result arrays in order.
+
+        Raises TimeoutError if the tasks are not all done within timeout seconds.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._map(list(tasks)), self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _prepare(self):
+        self._queue = asyncio.Queue()
+
+    async def _running(self):
+        try:
+            await self._stopping.wait()
+        finally:
+            for handler in list(self._handlers):
+                handler.cancel()
+
+    async def _map(self, tasks):
+        if self.num_workers == 0:
+            raise RuntimeError('no workers connected; see wait_for_workers')
+        task_ids = []
+        for task in tasks:
+            task_id = next(self._ids)
+            self._tasks[task_id] = task
+            self._attempts[task_id] = 0
+            self._futures[task_id] = self._loop.create_future()
+            task_ids.append(task_id)
+            self._queue.put_nowait(task_id)
+        try:
+            return await asyncio.gather(*(self._futures[i] for i in task_ids))
+        finally:
+            # Tasks still queued after a failure are skipped by the handlers
+            for task_id in task_ids:
+                self._futures.pop(task_id).cancel()
+                del self._tasks[task_id], self._attempts[task_id]
+
+    def _retry(self, task_id, reason):
+        future = self._futures.get(task_id)
+        if future is None or future.done():
+            return
+        self._attempts[task_id] += 1
+        if self._attempts[task_id] >= self.max_attempts:
+            future.set_exception(RuntimeError(
+                f'task {self._tasks[task_id]} failed {self._attempts[task_id]} times: {reason}'))
+        else:
+            self._queue.put_nowait(task_id)
+
+    async def _next_task(self, reader):
+        # Idle workers send nothing, so a read that returns means the worker is gone
+        get = asyncio.ensure_future(self._queue.get())
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            await asyncio.wait((get, closed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            get.cancel()
+            closed.cancel()
+            await asyncio.gather(get, closed, return_exceptions=True)
+        if closed.cancelled():
+            return get.result()
+        if not get.cancelled():
+            self._queue.put_nowait(get.result())
+        return None
+
+    async def _handle(self, reader, writer):
+        self._handlers.add(asyncio.current_task())
+        self.num_workers += 1
+        task_id = None
+        try:
+            while True:
+                task_id = await self._next_task(reader)
+                if task_id is None:
+                    break
+                future = self._futures.get(task_id)
+                if future is None or future.done():
+                    task_id = None
+                    continue
+                try:
+                    message = encode_message({'type': 'task', 'task': self._tasks[task_id]})
+                except (TypeError, ValueError) as error:
+                    # Not worth retrying: the task itself cannot be sent
+                    future.set_exception(error)
+                    task_id = None
+                    continue
+                writer.write(message)
+                await writer.drain()
+                try:
+                    header, arrays = await asyncio.wait_for(read_message(reader),
+                                                            self.task_timeout)
+                except asyncio.TimeoutError:
+                    self._retry(task_id, f'no result within {self.task_timeout}s')
+                    break
+                if header['type'] == 'error':
+                    self._retry(task_id, header['error'])
+                elif not future.done():
+                    future.set_result(arrays)
+                task_id = None
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if task_id is not None:
+                self._retry(task_id, 'worker connection lost')
+        except asyncio.CancelledError:
+            pass
+        except Exception as error:
+            # Fail the task with the real error instead of leaving map() waiting
+            future = self._futures.get(task_id)
+            if future is not None and not future.done():
+                future.set_exception(error)
+        finally:
+            self.num_workers -= 1
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+            if self.num_workers == 0:
+                # Nobody is left to take the queued tasks
+                for future in self._futures.values():
+                    if not future.done():
+                        future.set_exception(RuntimeError('all workers disconnected'))
+
+
+def run_task(task):
+    """Compute one task dict from src.sweep.sweep_tasks; returns its arrays."""
+    from src.sweep import SWEEP_CHUNKS
+
+    return SWEEP_CHUNKS[task['engine']](task['params'], task['seed'], task['start'],
+                                        task['stop'], task['num_periods'])
+
+
+def run_worker(host='127.0.0.1', port=8766, connect_timeout=60.0):
+    """Connect to a coordinator and run its tasks until it closes the connection.
+
+    Retries the connection for up to connect_timeout seconds. Returns the
+    number of tasks completed.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    completed = 0
+    with sock, sock.makefile('rb') as reader:
+        while True:
+            try:
+                header, _ = receive_message(reader)
+            except (EOFError, ConnectionError):
+                return completed
+            try:
+                reply = encode_message({'type': 'result'}, run_task(header['task']))
+            except Exception:
+                reply = encode_message({'type': 'error', 'error': traceback.format_exc()})
+            try:
+                sock.sendall(reply)
+            except ConnectionError:
+                return completed
+            completed += 1
+
+
+def start_local_workers(num_workers, host='127.0.0.1', port=8766):
+    """Start num_workers worker processes on this machine (e.g. for testing on localhost)."""
+    workers = [multiprocessing.Process(target=run_worker, args=(host, port), daemon=True)
+               for _ in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a sweep worker.')
+    parser.add_argument('--host', default='127.0.0.1', help='coordinator host')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--connect-timeout', type=float, default=60.0)
+    args = parser.parse_args(argv)
+    completed = run_worker(args.host, args.port, args.connect_timeout)
+    print(f'{completed} task(s) completed')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
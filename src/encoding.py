@@ -0,0 +1,8 @@
+def json_default(value):
+    """json.dumps default for NumPy scalars and arrays and other iterables (e.g. a range)."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    try:
+        return list(value)
+    except TypeError:
+        raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable') from None
@@ -0,0 +1,153 @@
+import numpy as np
+
+# Default storage layout and demand used by sim_fifo_single / simFIFO
+AREA_CAPACITIES = (92, 166, 170, 226)
+ARRIVAL_MEAN = 100
+REMOVAL_MEAN = 80
+
+# Bump whenever a change alters simulated results, so cached sweeps are recomputed
+MODEL_VERSION = 1
+
+
+def step_counts(counts, capacities, arrivals, removals):
+    """Advance a (simulations x areas) occupancy array by one period.
+
+    Removals are taken from the first non-empty area onwards, then arrivals
+    are stored first-fit, exactly like the per-item loops in sim_fifo_single.
+    """
+    # Items sitting in lower-numbered areas are removed before this area is touched
+    ahead = np.cumsum(counts, axis=1) - counts
+    removed = np.clip(removals[:, None] - ahead, 0, counts)
+    counts = counts - removed
+
+    # Free slots in lower-numbered areas are filled before this area is touched
+    free = capacities - counts
+    ahead = np.cumsum(free, axis=1) - free
+    stored = np.clip(arrivals[:, None] - ahead, 0, free)
+    counts = counts + stored
+
+    return counts, stored, removed
+
+
+def run_batch(arrivals, removals, capacities=AREA_CAPACITIES, profiler=None,
+              return_rejected=False):
+    """Run every replication at once from pre-drawn (simulations x periods) streams.
+
+    Returns the end-of-period occupancy as a (simulations x periods x areas) array,
+    plus the (simulations x periods) rejected arrivals if return_rejected is set.
+    capacities may also be a (simulations x areas) array, giving every
+    replication its own layout. A src.profiling.PhaseProfiler passed as
+    profiler times each period's step.
+    """
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    removals = np.asarray(removals, dtype=np.int64)
+    capacities = np.asarray(capacities, dtype=np.int64)
+    num_simulations, num_periods = arrivals.shape
+    num_areas = capacities.shape[-1]
+
+    occupancy = np.empty((num_simulations, num_periods, num_areas), dtype=np.int64)
+    counts = np.zeros((num_simulations, num_areas), dtype=np.int64)
+    rejected = np.empty((num_simulations, num_periods), dtype=np.int64) if return_rejected else None
+    for period in range(num_periods):
+        if profiler is not None:
+            profiler.begin(period)
+        counts, stored, removed = step_counts(counts, capacities, arrivals[:, period],
+                                              removals[:, period])
+        occupancy[:, period] = counts
+        if rejected is not None:
+            rejected[:, period] = arrivals[:, period] - stored.sum(axis=1)
+        if profiler is not None:
+            profiler.lap('step')
+            items_stored = int(stored.sum())
+            profiler.count('items_stored', items_stored)
+            profiler.count('items_removed', int(removed.sum()))
+            profiler.count('rejected', int(arrivals[:, period].sum()) - items_stored)
+
+    if return_rejected:
+        return occupancy, rejected
+    return occupancy
+
+
+def seed_sequence(seed):
+    """np.random.SeedSequence for seed; SeedSequence instances pass through unchanged."""
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def replication_seeds(seed, start, stop):
+    """SeedSequences for replications start..stop-1 of the run seeded by ``seed``.
+
+    Replication i always gets the i-th child of the master SeedSequence, so the
+    streams do not depend on how replications are grouped into chunks.
+    """
+    root = seed_sequence(seed)
+    return [np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (i,),
+                                   pool_size=root.pool_size)
+            for i in range(start, stop)]
+
+
+def draw_streams(seed_seqs, num_periods, arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN):
+    """Draw (replications x periods) arrival and removal counts, one generator per replication."""
+    arrivals = np.empty((len(seed_seqs), num_periods), dtype=np.int64)
+    removals = np.empty((len(seed_seqs), num_periods), dtype=np.int64)
+    for i, seed_seq in enumerate(seed_seqs):
+        rng = np.random.default_rng(seed_seq)
+        arrivals[i] = rng.poisson(arrival_mean, num_periods)
+        removals[i] = rng.poisson(removal_mean, num_periods)
+    return arrivals, removals
+
+
+def simulate_chunk(seed, start, stop, num_periods, capacities=AREA_CAPACITIES,
+                   arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN):
+    """Occupancy array for replications start..stop-1 (process-pool work unit)."""
+    arrivals, removals = draw_streams(replication_seeds(seed, start, stop), num_periods,
+                                      arrival_mean, removal_mean)
+    occupancy = run_batch(arrivals, removals, capacities)
+    # Ship the smallest integer type back to the parent process
+    return occupancy.astype(np.min_scalar_type(max(capacities)))
+
+
+def occupancy_frame(occupancy):
+    """Convert a (simulations x periods x areas) array to simFIFO's long DataFrame.
+
+    Occupancy columns are int64 whatever the array's integer type.
+    """
+    import pandas as pd
+
+    num_simulations, num_periods, num_areas = occupancy.shape
+    data = {'period': np.tile(np.arange(num_periods), num_simulations)}
+    for area in range(num_areas):
+        data[f'area{area + 1}_occupancy'] = occupancy[:, :, area].astype(np.int64).ravel()
+    data['simulation'] = np.repeat(np.arange(num_simulations), num_periods)
+    return pd.DataFrame(data)
+
+
+def sim_fifo_batch(num_simulations=1000, num_periods=100, capacities=AREA_CAPACITIES,
+                   arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN, rng=None, profiler=None,
+                   compact=False, live=None):
+    """Vectorized equivalent of simFIFO: all replications advance together.
+
+    compact=True returns a src.results.SimulationResults instead of the DataFrame.
+    The finished run is published to ``live`` (a src.live.LiveServer) as one chunk.
+    """
+    if rng is None:
+        rng = np.random
+    if profiler is not None:
+        profiler.begin()
+    arrivals = rng.poisson(arrival_mean, size=(num_simulations, num_periods))
+    removals = rng.poisson(removal_mean, size=(num_simulations, num_periods))
+    if profiler is not None:
+        profiler.lap('draws')
+    occupancy = run_batch(arrivals, removals, capacities, profiler)
+    if live is not None:
+        from src.live import ChunkMetrics
+        ChunkMetrics(live, num_simulations, num_periods).add(occupancy)
+    if compact:
+        from src.results import SimulationResults
+
+        return SimulationResults(occupancy, capacities)
+    if profiler is not None:
+        profiler.begin()
+    results = occupancy_frame(occupancy)
+    if profiler is not None:
+        profiler.lap('dataframe')
+    return results
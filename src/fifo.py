@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class AreaFIFO:
+    """Fixed-capacity FIFO of stored items backed by preallocated ring buffers.
+
+    Each slot holds the period an item was stored in and its integer id.
+    push/pop are O(1); push_n/pop_n move whole batches with at most two slice
+    copies (one when the batch wraps around the end of the buffer).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.periods = np.empty(capacity, dtype=np.int64)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def free(self):
+        return self.capacity - self.size
+
+    def _slices(self, start, n):
+        # Split [start, start + n) of the ring into at most two contiguous pieces
+        start %= self.capacity
+        first = min(n, self.capacity - start)
+        return slice(start, start + first), slice(0, n - first)
+
+    def push(self, period, item_id):
+        if self.size == self.capacity:
+            raise IndexError('push to full AreaFIFO')
+        tail = (self.head + self.size) % self.capacity
+        self.periods[tail] = period
+        self.ids[tail] = item_id
+        self.size += 1
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError('pop from empty AreaFIFO')
+        item = (int(self.periods[self.head]), int(self.ids[self.head]))
+        self.head = (self.head + 1) % self.capacity
+        self.size -= 1
+        return item
+
+    def peek(self):
+        """Storage period of the oldest item, or None when empty."""
+        return int(self.periods[self.head]) if self.size else None
+
+    def push_n(self, period, first_id, n):
+        """Store n items arriving in ``period`` with ids first_id..first_id+n-1."""
+        if n > self.capacity - self.size:
+            raise IndexError('push_n beyond AreaFIFO capacity')
+        if n <= 0:
+            return
+        first, second = self._slices(self.head + self.size, n)
+        split = first.stop - first.start
+        self.periods[first] = period
+        self.periods[second] = period
+        self.ids[first] = np.arange(first_id, first_id + split)
+        self.ids[second] = np.arange(first_id + split, first_id + n)
+        self.size += n
+
+    def pop_n(self, n):
+        """Remove the n oldest items; returns (storage periods, ids) arrays."""
+        if n > self.size:
+            raise IndexError('pop_n beyond AreaFIFO size')
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        first, second = self._slices(self.head, n)
+        periods = np.concatenate((self.periods[first], self.periods[second]))
+        ids = np.concatenate((self.ids[first], self.ids[second]))
+        self.head = (self.head + n) % self.capacity
+        self.size -= n
+        return periods, ids
+
+    def id_at(self, offset):
+        """Id of the item offset places behind the oldest, or None past the end."""
+        if offset >= self.size:
+            return None
+        return int(self.ids[(self.head + offset) % self.capacity])
+
+    def id_from_tail(self, offset):
+        """Id of the item offset places before the newest, or None past the start."""
+        if offset >= self.size:
+            return None
+        return int(self.ids[(self.head + self.size - 1 - offset) % self.capacity])
+
+    def count_older(self, item_id):
+        """Number of items from the head with an id below item_id.
+
+        Ids increase from head to tail (items are pushed in arrival order),
+        so this is a binary search in each of the two ring pieces.
+        """
+        first, second = self._slices(self.head, self.size)
+        count = int(np.searchsorted(self.ids[first], item_id))
+        if count == first.stop - first.start:
+            count += int(np.searchsorted(self.ids[second], item_id))
+        return count
+
+    def count_newer(self, item_id):
+        """Number of items from the tail with an id above item_id."""
+        return self.size - self.count_older(item_id + 1)
+
+    def pop_last_n(self, n):
+        """Remove the n newest items; returns (storage periods, ids) arrays, newest last."""
+        if n > self.size:
+            raise IndexError('pop_last_n beyond AreaFIFO size')
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        first, second = self._slices(self.head + self.size - n, n)
+        periods = np.concatenate((self.periods[first], self.periods[second]))
+        ids = np.concatenate((self.ids[first], self.ids[second]))
+        self.size -= n
+        return periods, ids
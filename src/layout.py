@@ -0,0 +1,140 @@
+import numpy as np
+
+from src.engine import AREA_CAPACITIES
+
+
+class StorageLayout:
+    """Storage areas of a site: capacity, drawing position and name per area.
+
+    Areas are ordered; first-fit storage and first-non-empty removal follow
+    this order. Positions are (x, y) in the unit square of the animation and
+    default to evenly spaced points on the middle line.
+    """
+
+    def __init__(self, capacities, positions=None, names=None):
+        self.capacities = tuple(int(c) for c in capacities)
+        num_areas = len(self.capacities)
+        if positions is None:
+            xs = np.linspace(0.2, 0.8, num_areas) if num_areas > 1 else [0.5]
+            positions = [(float(x), 0.5) for x in xs]
+        if names is None:
+            names = [f'Area {i+1}' for i in range(num_areas)]
+        if len(positions) != num_areas or len(names) != num_areas:
+            raise ValueError("capacities, positions and names must have one entry per area")
+        self.positions = [tuple(pos) for pos in positions]
+        self.names = list(names)
+
+    def __len__(self):
+        return len(self.capacities)
+
+    @property
+    def total_capacity(self):
+        return sum(self.capacities)
+
+    @property
+    def columns(self):
+        """Occupancy column names used in result DataFrames."""
+        return [f'area{i+1}_occupancy' for i in range(len(self))]
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build a layout from {'areas': [{'capacity': .., 'pos': .., 'name': ..}, ...]}."""
+        areas = config['areas']
+        capacities = [area['capacity'] for area in areas]
+        positions = None
+        if all('pos' in area for area in areas):
+            positions = [area['pos'] for area in areas]
+        names = None
+        if all('name' in area for area in areas):
+            names = [area['name'] for area in areas]
+        return cls(capacities, positions, names)
+
+    def to_dict(self):
+        return {'areas': [{'capacity': c, 'pos': list(p), 'name': n}
+                          for c, p, n in zip(self.capacities, self.positions, self.names)]}
+
+    def areas(self):
+        """The {area_num: {'capacity', 'pos', 'name'}} dict used by the visualizer."""
+        return {i + 1: {'capacity': c, 'pos': p, 'name': n}
+                for i, (c, p, n) in enumerate(zip(self.capacities, self.positions, self.names))}
+
+
+DEFAULT_LAYOUT = StorageLayout(AREA_CAPACITIES,
+                               positions=[(0.2, 0.5), (0.4, 0.5), (0.6, 0.5), (0.8, 0.5)])
+
+
+class FirstFitIndex:
+    """Sum segment trees over free and occupied slots of every area.
+
+    "First non-full area" and "first non-empty area" are found by descending
+    the tree in O(log N); store/remove touch each affected area in O(log N),
+    so the cost of a period no longer grows linearly with the number of areas.
+    """
+
+    def __init__(self, capacities):
+        self.num_areas = len(capacities)
+        size = 1
+        while size < self.num_areas:
+            size *= 2
+        self.size = size
+        self.free = [0] * (2 * size)
+        self.occupied = [0] * (2 * size)
+        self.free[size:size + self.num_areas] = [int(c) for c in capacities]
+        for i in range(size - 1, 0, -1):
+            self.free[i] = self.free[2 * i] + self.free[2 * i + 1]
+
+    def occupancy(self, area):
+        return self.occupied[self.size + area]
+
+    def free_slots(self, area):
+        return self.free[self.size + area]
+
+    def total_occupied(self):
+        return self.occupied[1]
+
+    def _first(self, tree):
+        # Leftmost leaf with a positive count, or None
+        if tree[1] <= 0:
+            return None
+        i = 1
+        while i < self.size:
+            i = 2 * i if tree[2 * i] > 0 else 2 * i + 1
+        return i - self.size
+
+    def first_free(self):
+        """Index of the first area that is not full, or None."""
+        return self._first(self.free)
+
+    def first_occupied(self):
+        """Index of the first area that is not empty, or None."""
+        return self._first(self.occupied)
+
+    def move(self, area, count):
+        """Store count items in an area (or remove them when count < 0)."""
+        i = self.size + area
+        while i:
+            self.free[i] -= count
+            self.occupied[i] += count
+            i //= 2
+
+    def store(self, n):
+        """Store n items first-fit; returns [(area, count), ...] in area order."""
+        moves = []
+        while n > 0 and self.free[1] > 0:
+            area = self.first_free()
+            count = min(n, self.free[self.size + area])
+            self.move(area, count)
+            moves.append((area, count))
+            n -= count
+        return moves
+
+    def remove(self, n):
+        """Remove n items from the first non-empty areas; returns [(area, count), ...]."""
+        moves = []
+        while n > 0 and self.occupied[1] > 0:
+            area = self.first_occupied()
+            count = min(n, self.occupied[self.size + area])
+            self.move(area, -count)
+            moves.append((area, count))
+            n -= count
+        return moves
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import threading
+import time
+
+import numpy as np
+
+from src.background import BackgroundServer
+from src.encoding import json_default
+
+INDEX_PAGE = b"""<!doctype html>
+<html><head><title>Storage simulation</title></head>
+<body><h1>Storage simulation</h1><pre id="metrics">waiting for metrics...</pre>
+<script>
+new EventSource('/events').addEventListener('metrics', function (e) {
+  document.getElementById('metrics').textContent = JSON.stringify(JSON.parse(e.data), null, 2);
+});
+</script></body></html>
+"""
+
+
+def _jsonable(value):
+    # Anything else is shown as text rather than stopping the stream
+    try:
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+
+class LiveServer(BackgroundServer):
+    """Local HTTP server streaming the latest published metrics as Server-Sent Events.
+
+    The server runs an asyncio loop on a daemon thread. publish() only swaps
+    the latest snapshot under a lock, so the simulation never waits on the
+    network. Every min_interval seconds a changed snapshot is serialized
+    once and offered to each client; a client that is still busy with the
+    previous update simply gets the newer one instead (coalescing).
+
+    Routes: ``/`` a minimal dashboard, ``/metrics`` the latest snapshot as
+    JSON and ``/events`` the SSE stream.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, min_interval=0.5, keepalive=15.0):
+        super().__init__(host, port)
+        self.min_interval = min_interval
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._latest = None
+        self._version = 0
+        self._sent_version = 0
+        self._payload = None
+        self._clients = set()
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/'
+
+    def publish(self, metrics):
+        """Make metrics (a JSON-serializable dict) the latest snapshot."""
+        with self._lock:
+            self._latest = metrics
+            self._version += 1
+
+    async def _running(self):
+        broadcaster = asyncio.create_task(self._broadcast())
+        try:
+            await self._stopping.wait()
+            # Publish whatever came in since the last tick before closing the streams
+            self._refresh()
+        finally:
+            broadcaster.cancel()
+            for queue in list(self._clients):
+                self._offer(queue, None)
+
+    def _refresh(self):
+        with self._lock:
+            latest, version = self._latest, self._version
+        if latest is None or version == self._sent_version:
+            return
+        self._sent_version = version
+        data = json.dumps(latest, default=_jsonable)
+        self._payload = data.encode()
+        message = f'event: metrics\ndata: {data}\n\n'.encode()
+        for queue in self._clients:
+            self._offer(queue, message)
+
+    async def _broadcast(self):
+        while True:
+            await asyncio.sleep(self.min_interval)
+            self._refresh()
+
+    @staticmethod
+    def _offer(queue, message):
+        # Keep only the newest message for clients that have not caught up
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request.decode('latin-1').split()
+            path = parts[1] if len(parts) > 1 else '/'
+            if path == '/events':
+                await self._stream(writer)
+            elif path == '/metrics':
+                self._respond(writer, b'200 OK', 'application/json', self._payload or b'null')
+            elif path == '/':
+                self._respond(writer, b'200 OK', 'text/html', INDEX_PAGE)
+            else:
+                self._respond(writer, b'404 Not Found', 'text/plain', b'not found')
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer, status, content_type, body):
+        writer.write(b'HTTP/1.1 ' + status + b'\r\n'
+                     + f'Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n'
+                       'Connection: close\r\n\r\n'.encode() + body)
+
+    async def _stream(self, writer):
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                     b'Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n')
+        queue = asyncio.Queue(maxsize=1)
+        if self._payload is not None:
+            queue.put_nowait(b'event: metrics\ndata: ' + self._payload + b'\n\n')
+        self._clients.add(queue)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    message = b': keepalive\n\n'
+                if message is None:
+                    break
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
+
+
+class RunMetrics:
+    """simFIFO observer that aggregates period records and publishes them to a LiveServer.
+
+    Publishes occupancy (latest and running mean per area), stored, removed
+    and rejected totals, throughput and progress, at most every ``interval``
+    seconds; call flush() after the run for the final numbers.
+    """
+
+    def __init__(self, server, num_simulations=None, num_periods=None, interval=0.25):
+        self.server = server
+        self.total_periods = None
+        if num_simulations and num_periods:
+            self.total_periods = num_simulations * num_periods
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_publish = 0.0
+        self.periods = 0
+        self.occupancy_sum = None
+        self.occupancy = None
+        self.simulation = None
+        self.totals = {'stored': 0, 'removed': 0, 'rejected': 0}
+
+    def __call__(self, record):
+        occupancy = record['occupancy']
+        if self.occupancy_sum is None:
+            self.occupancy_sum = [0] * len(occupancy)
+        for i, count in enumerate(occupancy):
+            self.occupancy_sum[i] += count
+        self.occupancy = occupancy
+        self.simulation = record.get('simulation')
+        self.totals['stored'] += sum(record['stored'])
+        self.totals['removed'] += sum(record['removed'])
+        self.totals['rejected'] += record['rejected']
+        self.periods += 1
+
+        now = time.perf_counter()
+        if now - self.last_publish >= self.interval:
+            self.last_publish = now
+            self.flush()
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.start
+        return {
+            'simulation': self.simulation,
+            'periods': self.periods,
+            'progress': self.periods / self.total_periods if self.total_periods else None,
+            'elapsed': elapsed,
+            'periods_per_second': self.periods / elapsed if elapsed > 0 else None,
+            'occupancy': self.occupancy,
+            'mean_occupancy': ([total / self.periods for total in self.occupancy_sum]
+                               if self.periods else None),
+            **self.totals,
+        }
+
+    def flush(self):
+        self.server.publish(self.snapshot())
+
+
+class ChunkMetrics:
+    """Publishes progress and occupancy to a LiveServer as chunks of replications complete.
+
+    Used by simFIFO's chunked modes (seed/n_jobs, out, checkpoint and
+    vectorized), where replications finish a chunk at a time, often in
+    worker processes. Snapshots use RunMetrics' keys where they apply:
+    'occupancy' is the latest chunk's mean end-of-run occupancy per area.
+    """
+
+    def __init__(self, server, num_simulations, num_periods):
+        self.server = server
+        self.num_simulations = num_simulations
+        self.num_periods = num_periods
+        self.start = time.perf_counter()
+        self.simulations = 0
+        self.computed = 0
+        self.occupancy_sum = None
+        self.occupancy = None
+
+    def add(self, occupancy):
+        """Count a finished (chunk x periods x areas) occupancy array and publish."""
+        sums = occupancy.sum(axis=(0, 1), dtype=np.int64)
+        self.occupancy_sum = sums if self.occupancy_sum is None else self.occupancy_sum + sums
+        self.occupancy = occupancy[:, -1].mean(axis=0)
+        self.simulations += len(occupancy)
+        self.computed += len(occupancy)
+        self.flush()
+
+    def skip(self, count):
+        """Count replications that were already done (e.g. resumed from a checkpoint)."""
+        self.simulations += count
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.start
+        periods = self.computed * self.num_periods
+        return {
+            'simulations': self.simulations,
+            'periods': self.simulations * self.num_periods,
+            'progress': self.simulations / self.num_simulations if self.num_simulations else None,
+            'elapsed': elapsed,
+            'periods_per_second': periods / elapsed if elapsed > 0 else None,
+            'occupancy': self.occupancy,
+            'mean_occupancy': (self.occupancy_sum / periods if self.computed else None),
+        }
+
+    def flush(self):
+        self.server.publish(self.snapshot())
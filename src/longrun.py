@@ -0,0 +1,133 @@
+import numpy as np
+
+from src.engine import ARRIVAL_MEAN, REMOVAL_MEAN
+from src.layout import DEFAULT_LAYOUT, FirstFitIndex
+from src.stats import z_value
+
+
+def mser_truncation(series, max_fraction=0.5):
+    """MSER warm-up truncation point of a series of (batch) means.
+
+    Returns the d minimizing the variance of the mean of series[d:],
+    sum((y - mean)^2) / (n - d)^2, searched over the first max_fraction of
+    the series so the estimate always keeps enough data.
+    """
+    series = np.asarray(series, dtype=float)
+    n = len(series)
+    if n < 2:
+        return 0
+    # Suffix sums give every candidate's statistic in one pass
+    suffix_sum = np.cumsum(series[::-1])[::-1]
+    suffix_sq = np.cumsum(series[::-1] ** 2)[::-1]
+    remaining = np.arange(n, 0, -1)
+    stat = (suffix_sq - suffix_sum ** 2 / remaining) / remaining ** 2
+    return int(np.argmin(stat[:max(1, int(n * max_fraction))]))
+
+
+def batch_means_ci(batches, confidence=0.95):
+    """Mean, CI half-width and lag-1 autocorrelation of batch means (batches along axis 0).
+
+    The half-width treats the batches as independent; a lag-1
+    autocorrelation well above zero means the batches are too short.
+    """
+    batches = np.asarray(batches, dtype=float)
+    k = len(batches)
+    mean = batches.mean(axis=0)
+    if k < 2:
+        nan = np.full(mean.shape, np.nan)
+        return mean, nan, nan
+    half_width = z_value(confidence) * batches.std(axis=0, ddof=1) / np.sqrt(k)
+    centered = batches - mean
+    denominator = (centered ** 2).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        lag1 = (centered[1:] * centered[:-1]).sum(axis=0) / denominator
+    return mean, half_width, lag1
+
+
+def sim_fifo_long(num_periods=1_000_000, num_batches=32, record_every=None,
+                  arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN, layout=DEFAULT_LAYOUT,
+                  seed=None, confidence=0.95, block=65536):
+    """One very long replication with constant-memory batch-means output.
+
+    Per-area occupancy and rejected arrivals are summed into between
+    num_batches and 2 * num_batches equal buckets: whenever all 2 * num_batches
+    are filled, neighbours are merged and the bucket length doubles, so
+    memory does not grow with num_periods. A trailing partial bucket is left
+    out. The warm-up is cut by MSER on the bucket means of total occupancy,
+    and steady-state means come with batch-means confidence intervals.
+
+    record_every=k additionally keeps every k-th period's occupancy (memory
+    num_periods / k). Returns a dict of estimates and the bucket means.
+    """
+    rng = np.random.default_rng(seed)
+    num_areas = len(layout)
+    index = FirstFitIndex(layout.capacities)
+    occupancy = [0] * num_areas
+
+    bucket_size = 1
+    position = 0
+    # Bucket sums per area (end-of-period occupancy) plus rejected arrivals in the last slot
+    sums = [0] * (num_areas + 1)
+    buckets = []
+
+    recorded = None
+    if record_every:
+        recorded = np.zeros((num_periods // record_every, num_areas), dtype=np.int64)
+
+    for block_start in range(0, num_periods, block):
+        size = min(block, num_periods - block_start)
+        arrivals = rng.poisson(arrival_mean, size).tolist()
+        removals = rng.poisson(removal_mean, size).tolist()
+        for offset in range(size):
+            # A change now is seen at the end of every remaining period of the bucket
+            remaining = bucket_size - position
+            for area, count in index.remove(removals[offset]):
+                occupancy[area] -= count
+                sums[area] -= count * remaining
+            new_items = arrivals[offset]
+            for area, count in index.store(new_items):
+                occupancy[area] += count
+                sums[area] += count * remaining
+                new_items -= count
+            sums[num_areas] += new_items
+
+            if recorded is not None:
+                period = block_start + offset + 1
+                if period % record_every == 0:
+                    recorded[period // record_every - 1] = occupancy
+
+            position += 1
+            if position == bucket_size:
+                buckets.append(sums)
+                if len(buckets) == 2 * num_batches:
+                    buckets = [[a + b for a, b in zip(first, second)]
+                               for first, second in zip(buckets[::2], buckets[1::2])]
+                    bucket_size *= 2
+                position = 0
+                sums = [count * bucket_size for count in occupancy] + [0]
+
+    means = np.array(buckets, dtype=float).reshape(-1, num_areas + 1) / bucket_size
+    areas, rejected = means[:, :num_areas], means[:, num_areas]
+    total = areas.sum(axis=1)
+    warmup = mser_truncation(total)
+
+    area_mean, area_half_width, _ = batch_means_ci(areas[warmup:], confidence)
+    total_mean, total_half_width, total_lag1 = batch_means_ci(total[warmup:], confidence)
+    rejected_mean, rejected_half_width, _ = batch_means_ci(rejected[warmup:], confidence)
+    result = {
+        'num_periods': num_periods,
+        'batch_size': bucket_size,
+        'warmup_periods': warmup * bucket_size,
+        'batches': len(means) - warmup,
+        'area_mean': area_mean,
+        'area_half_width': area_half_width,
+        'total_mean': float(total_mean),
+        'total_half_width': float(total_half_width),
+        'rejected_mean': float(rejected_mean),
+        'rejected_half_width': float(rejected_half_width),
+        'batch_lag1': float(total_lag1),
+        'batch_means': means,
+    }
+    if recorded is not None:
+        result['recorded'] = recorded
+    return result
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+
+from src.compare import poisson_pmf
+from src.engine import AREA_CAPACITIES, ARRIVAL_MEAN, REMOVAL_MEAN
+
+
+def _clipped_steps(pmf, size):
+    # steps[n, m] = P(n + X clipped to size - 1 == m) for X with the given pmf
+    steps = np.zeros((size, size))
+    tail = 1 - np.concatenate([[0.0], np.cumsum(pmf)])
+    for n in range(size):
+        steps[n, n:size - 1] = pmf[:size - 1 - n]
+        steps[n, size - 1] = max(tail[size - 1 - n], 0.0)
+    return steps
+
+
+def total_transition_steps(capacities=AREA_CAPACITIES, arrival_mean=ARRIVAL_MEAN,
+                            removal_mean=REMOVAL_MEAN):
+    """One-period transition of the total number of stored items, in two steps.
+
+    Removals come first and are clipped at zero, then arrivals are stored
+    and clipped at the total capacity, exactly as in sim_fifo_single. The
+    first-fit order does not change the total, so the total alone is a
+    Markov chain on 0..sum(capacities).
+
+    Returns (removal, arrival) step matrices; their product is the
+    transition matrix, and the intermediate post-removal distribution is
+    what overflow probabilities are computed from.
+    """
+    size = sum(capacities) + 1
+    removal = _clipped_steps(poisson_pmf(removal_mean, size), size)[::-1, ::-1].copy()
+    arrival = _clipped_steps(poisson_pmf(arrival_mean, size), size)
+    return removal, arrival
+
+
+def stationary_distribution(transition):
+    """Solve pi P = pi, sum(pi) = 1 (dense, the state space is small)."""
+    size = len(transition)
+    system = transition.T - np.eye(size)
+    system[-1] = 1.0
+    rhs = np.zeros(size)
+    rhs[-1] = 1.0
+    pi = np.linalg.solve(system, rhs)
+    return np.clip(pi, 0, None) / np.clip(pi, 0, None).sum()
+
+
+def expected_rejections(after_removal, arrival_mean, capacity):
+    """P(some arrival is rejected) and E[rejected arrivals] given the post-removal distribution."""
+    size = capacity + 1
+    # Enough Poisson support that the truncated tail is negligible
+    support = size + int(arrival_mean + 12 * math.sqrt(arrival_mean) + 12)
+    pmf = poisson_pmf(arrival_mean, support)
+    k = np.arange(support)
+    free = capacity - np.arange(size)
+    probability = np.array([pmf[f + 1:].sum() for f in free])
+    excess = np.array([(pmf[f + 1:] * (k[f + 1:] - f)).sum() for f in free])
+    return after_removal @ probability, after_removal @ excess
+
+
+def packed_occupancy(totals, capacities=AREA_CAPACITIES):
+    """Per-area occupancy when ``totals`` items are packed first-fit into the areas."""
+    totals = np.asarray(totals)
+    capacities = np.asarray(capacities)
+    before = np.cumsum(capacities) - capacities
+    return np.clip(totals[..., None] - before, 0, capacities)
+
+
+def area_distributions(distribution, capacities=AREA_CAPACITIES):
+    """Per-area occupancy distributions implied by a distribution over totals.
+
+    Assumes the items are packed into the lowest areas (see packed_occupancy).
+    Removals empty the lowest areas first, so the real system can hold items
+    in higher areas while lower ones have room: this is an approximation,
+    unlike the total distribution itself, and it understates the occupancy
+    of higher areas after heavy removal periods.
+    """
+    packed = packed_occupancy(np.arange(len(distribution)), capacities)
+    return [np.bincount(packed[:, i], weights=distribution, minlength=c + 1)
+            for i, c in enumerate(capacities)]
+
+
+def sim_fifo_markov(num_periods=100, capacities=AREA_CAPACITIES, arrival_mean=ARRIVAL_MEAN,
+                    removal_mean=REMOVAL_MEAN, initial=0):
+    """Exact distribution of total occupancy instead of Monte Carlo replications.
+
+    Starts from ``initial`` stored items (the simulations start empty) and
+    returns a dict with:
+
+    - 'transient': (num_periods x states) distribution of end-of-period total
+    - 'stationary': the long-run distribution
+    - 'mean_total', 'full_probability', 'rejection_probability' and
+      'expected_rejected' per period, plus their stationary values
+    - 'area_mean': (num_periods x areas) mean occupancy per area under the
+      first-fit packing approximation of area_distributions
+    """
+    capacity = sum(capacities)
+    removal, arrival = total_transition_steps(capacities, arrival_mean, removal_mean)
+    transition = removal @ arrival
+
+    transient = np.zeros((num_periods, capacity + 1))
+    after_removal = np.zeros((num_periods, capacity + 1))
+    state = np.zeros(capacity + 1)
+    state[initial] = 1.0
+    for period in range(num_periods):
+        after_removal[period] = state @ removal
+        state = after_removal[period] @ arrival
+        transient[period] = state
+    stationary = stationary_distribution(transition)
+
+    totals = np.arange(capacity + 1)
+    packed = packed_occupancy(totals, capacities)
+    rejection_probability, expected_rejected = expected_rejections(
+        after_removal, arrival_mean, capacity)
+    stationary_rejection, stationary_rejected = expected_rejections(
+        stationary @ removal, arrival_mean, capacity)
+    return {
+        'transient': transient,
+        'stationary': stationary,
+        'mean_total': transient @ totals,
+        'full_probability': transient[:, -1],
+        'rejection_probability': rejection_probability,
+        'expected_rejected': expected_rejected,
+        'stationary_mean_total': stationary @ totals,
+        'stationary_full_probability': stationary[-1],
+        'stationary_rejection_probability': stationary_rejection,
+        'stationary_expected_rejected': stationary_rejected,
+        'area_mean': transient @ packed,
+    }
@@ -0,0 +1,163 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.des import sim_fifo_des
+from src.engine import AREA_CAPACITIES, draw_streams, replication_seeds, run_batch
+from src.layout import DEFAULT_LAYOUT, StorageLayout
+from src.stats import z_value
+
+
+def capacity_splits(total_slots=sum(AREA_CAPACITIES), num_areas=len(AREA_CAPACITIES), step=10,
+                    min_capacity=10):
+    """Every split of total_slots into num_areas capacities that are multiples of step.
+
+    Each area gets at least min_capacity slots, rounded up to a whole step.
+
+    Returns a (candidates x areas) array. The count grows like
+    (total_slots / step) ** (num_areas - 1), so keep step coarse.
+    """
+    reserved = -(-min_capacity // step)
+    units = total_slots // step - num_areas * reserved
+    if units < 0:
+        raise ValueError("total_slots is too small for num_areas areas of min_capacity")
+    remainder = total_slots - step * (units + num_areas * reserved)
+    splits = []
+    # Stars and bars: choose where the num_areas - 1 bars go among units + num_areas - 1 slots
+    for bars in itertools.combinations(range(units + num_areas - 1), num_areas - 1):
+        edges = (-1,) + bars + (units + num_areas - 1,)
+        parts = [edges[i + 1] - edges[i] - 1 for i in range(num_areas)]
+        splits.append([(part + reserved) * step for part in parts])
+    splits = np.array(splits, dtype=np.int64)
+    # Slots that do not divide into steps go to the last area
+    splits[:, -1] += remainder
+    return splits
+
+
+def _evaluate_batch(candidates, seeds, num_periods, layout, **params):
+    # Rejected arrivals per period for every (candidate, replication) on common streams
+    arrivals, removals = draw_streams(seeds, num_periods, **params)
+    num_candidates, num_replications = len(candidates), len(seeds)
+    capacities = np.repeat(candidates, num_replications, axis=0)
+    _, rejected = run_batch(np.tile(arrivals, (num_candidates, 1)),
+                            np.tile(removals, (num_candidates, 1)),
+                            capacities, return_rejected=True)
+    return rejected.mean(axis=1).reshape(num_candidates, num_replications)
+
+
+def _des_rejected(capacities, seed_seq, num_periods, layout, params):
+    layout = StorageLayout(capacities, layout.positions, layout.names)
+    run = sim_fifo_des(num_periods, layout=layout, seed=seed_seq, **params)
+    return run['rejected_per_period'].mean()
+
+
+def _evaluate_des(candidates, seeds, num_periods, layout, n_jobs=1, **params):
+    jobs = [(tuple(capacities), seed_seq) for capacities in candidates for seed_seq in seeds]
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            values = list(pool.map(_des_rejected, *zip(*jobs), itertools.repeat(num_periods),
+                                   itertools.repeat(layout), itertools.repeat(params)))
+    else:
+        values = [_des_rejected(capacities, seed_seq, num_periods, layout, params)
+                  for capacities, seed_seq in jobs]
+    return np.array(values).reshape(len(candidates), len(seeds))
+
+
+OPTIMIZER_ENGINES = {
+    'batch': _evaluate_batch,
+    'des': _evaluate_des,
+}
+
+
+def successive_halving(candidates, evaluate, initial_replications=2, eta=3,
+                       max_replications=81, seed=0):
+    """Rank candidates by mean cost, spending replications on the promising ones.
+
+    evaluate(candidates, seeds) returns a (candidates x replications) cost
+    array for the given replication SeedSequences. Every round the survivors
+    are topped up to the round's replication count, the best 1/eta are kept
+    and the count grows eta-fold, until one candidate is left or
+    max_replications is reached. Replication i uses the same seed for every
+    candidate (common random numbers), so rankings compare like with like.
+
+    Returns one row per candidate: its mean cost and CI half-width over the
+    replications it got, and the round it was eliminated in (None for the
+    survivors).
+    """
+    import pandas as pd
+
+    candidates = np.asarray(candidates)
+    num_candidates = len(candidates)
+    costs = [[] for _ in range(num_candidates)]
+    eliminated = [None] * num_candidates
+    alive = np.arange(num_candidates)
+    replications = initial_replications
+    done = 0
+    round_num = 0
+    while True:
+        replications = min(replications, max_replications)
+        seeds = replication_seeds(seed, done, replications)
+        values = evaluate(candidates[alive], seeds)
+        for i, row in zip(alive, values):
+            costs[i].extend(row.tolist())
+        done = replications
+        means = np.array([np.mean(costs[i]) for i in alive])
+        if len(alive) == 1 or replications >= max_replications:
+            break
+        keep = max(1, math.ceil(len(alive) / eta))
+        order = np.argsort(means, kind='stable')
+        for i in alive[order[keep:]]:
+            eliminated[i] = round_num
+        alive = alive[np.sort(order[:keep])]
+        replications *= eta
+        round_num += 1
+
+    z = z_value()
+    rows = []
+    for i, capacities in enumerate(candidates):
+        values = np.array(costs[i])
+        half_width = np.nan
+        if len(values) > 1:
+            half_width = z * values.std(ddof=1) / math.sqrt(len(values))
+        rows.append({
+            'capacities': tuple(int(c) for c in capacities),
+            'mean': values.mean(),
+            'half_width': half_width,
+            'replications': len(values),
+            'eliminated_in_round': eliminated[i],
+        })
+    result = pd.DataFrame(rows)
+    survivors = result['eliminated_in_round'].isna()
+    return pd.concat([result[survivors].sort_values('mean'),
+                      result[~survivors].sort_values(['eliminated_in_round', 'mean'],
+                                                     ascending=[False, True])],
+                     ignore_index=True)
+
+
+def optimize_capacities(total_slots=sum(AREA_CAPACITIES), candidates=None, engine='des',
+                        num_periods=100, step=10, min_capacity=10, initial_replications=2,
+                        eta=3, max_replications=81, seed=0, layout=DEFAULT_LAYOUT, n_jobs=1,
+                        **params):
+    """Search capacity splits of total_slots for the fewest rejected arrivals per period.
+
+    candidates defaults to capacity_splits(total_slots, len(layout), step,
+    min_capacity); the layout's area positions are kept for every split.
+    engine='des' simulates forklift travel to each area (sim_fifo_des; params
+    such as num_loading_forklifts are passed on), where the split changes how
+    fast slots are freed and filled. With engine='batch' (the sim_fifo_single
+    model) rejections only depend on the total capacity, so every split of
+    the same total ties. Returns the successive_halving table; its first
+    row is the best split.
+    """
+    if candidates is None:
+        candidates = capacity_splits(total_slots, len(layout), step, min_capacity)
+    evaluate = OPTIMIZER_ENGINES[engine]
+    if engine == 'des':
+        params['n_jobs'] = n_jobs
+
+    def cost(batch, seeds):
+        return evaluate(batch, seeds, num_periods, layout, **params)
+
+    return successive_halving(candidates, cost, initial_replications, eta, max_replications, seed)
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.engine import (AREA_CAPACITIES, ARRIVAL_MEAN, REMOVAL_MEAN,
+                        occupancy_frame, seed_sequence, simulate_chunk)
+from src.results import SimulationResults
+
+
+def chunk_bounds(num_simulations, chunk_size):
+    """(start, stop) replication ranges covering 0..num_simulations-1."""
+    return [(start, min(start + chunk_size, num_simulations))
+            for start in range(0, num_simulations, chunk_size)]
+
+
+def sim_fifo_parallel(num_simulations=1000, num_periods=100, n_jobs=None, seed=None,
+                      chunk_size=None, capacities=AREA_CAPACITIES,
+                      arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN, compact=False,
+                      live=None):
+    """Run replications in chunks across a process pool.
+
+    Every replication draws from its own generator spawned from ``seed``, so
+    the merged result is identical for any n_jobs and chunk_size.
+    compact=True returns a SimulationResults instead of the DataFrame.
+    Progress is published to ``live`` (a src.live.LiveServer) after every chunk.
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool busy without tiny tasks
+        chunk_size = max(1, -(-num_simulations // (4 * n_jobs)))
+    # Fix the entropy up front so every worker derives the same streams
+    seed = seed_sequence(seed)
+
+    bounds = chunk_bounds(num_simulations, chunk_size)
+    args = [(seed, start, stop, num_periods, capacities, arrival_mean, removal_mean)
+            for start, stop in bounds]
+
+    metrics = None
+    if live is not None:
+        from src.live import ChunkMetrics
+        metrics = ChunkMetrics(live, num_simulations, num_periods)
+
+    occupancy = np.empty((num_simulations, num_periods, len(capacities)),
+                         dtype=np.min_scalar_type(max(capacities)))
+    if n_jobs == 1:
+        chunks = (simulate_chunk(*a) for a in args)
+        for (start, stop), chunk in zip(bounds, chunks):
+            occupancy[start:stop] = chunk
+            if metrics is not None:
+                metrics.add(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = pool.map(simulate_chunk, *zip(*args))
+            for (start, stop), chunk in zip(bounds, chunks):
+                occupancy[start:stop] = chunk
+                if metrics is not None:
+                    metrics.add(chunk)
+
+    if compact:
+        return SimulationResults(occupancy, capacities)
+    return occupancy_frame(occupancy)
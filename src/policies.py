@@ -0,0 +1,190 @@
+import heapq
+
+
+class AreaOrderPolicy:
+    """Remove from the lowest-numbered non-empty area first (the original rule).
+
+    Policies decide which stored items a removal request takes. They work
+    on the per-area AreaFIFO queues and keep the FirstFitIndex of free and
+    occupied slots up to date. remove(n) returns [(area, count, storage
+    periods), ...] for the areas it took items from, and stored(area, count)
+    is called after count items were pushed onto an area.
+    """
+
+    def __init__(self, queues, index):
+        self.queues = queues
+        self.index = index
+
+    def stored(self, area, count):
+        pass
+
+    def take(self, area, count):
+        """Pop the count oldest items of an area; returns their storage periods."""
+        periods, _ = self.queues[area].pop_n(count)
+        self.index.move(area, -count)
+        return periods
+
+    def remove(self, n):
+        return [(area, count, self.queues[area].pop_n(count)[0])
+                for area, count in self.index.remove(n)]
+
+
+class PriorityPolicy(AreaOrderPolicy):
+    """Remove from the areas with the lowest priority value first, oldest items first.
+
+    Areas sharing a priority are merged by arrival order: a heap holds
+    (priority, id of the oldest item, area) for every non-empty area, and
+    each step takes the whole run of the top area that is older than the
+    next area's oldest item. A removal of n items costs O(log areas) per run
+    instead of a rescan of the areas per item.
+    """
+
+    def __init__(self, queues, index, priorities=None):
+        super().__init__(queues, index)
+        if priorities is None:
+            priorities = [0] * len(queues)
+        if len(priorities) != len(queues):
+            raise ValueError("priorities must have one entry per area")
+        self.priorities = list(priorities)
+        self.heap = []
+        for area in range(len(queues)):
+            self._push(area)
+
+    def _key(self, area, taken=0):
+        # Heap key of an area once its first ``taken`` items are gone
+        item_id = self.queues[area].id_at(taken)
+        return None if item_id is None else (self.priorities[area], item_id)
+
+    def _run(self, area, taken, key):
+        # Items of area, after the taken ones, that come before an area whose top is key
+        queue = self.queues[area]
+        if key[0] > self.priorities[area]:
+            return len(queue) - taken
+        return queue.count_older(key[1]) - taken
+
+    def _push(self, area, taken=0):
+        key = self._key(area, taken)
+        if key is not None:
+            heapq.heappush(self.heap, (key, area))
+
+    def stored(self, area, count):
+        # The oldest item only changes when the area was empty
+        if len(self.queues[area]) == count:
+            self._push(area)
+
+    def remove(self, n):
+        heap = self.heap
+        taken = [0] * len(self.queues)
+
+        def valid(entry):
+            return self._key(entry[1], taken[entry[1]]) == entry[0]
+
+        # Merge runs on the heap, then pop each area once
+        while n > 0 and heap:
+            entry = heapq.heappop(heap)
+            if not valid(entry):
+                continue
+            area = entry[1]
+            # Drop stale entries and duplicates of this area to find the next competitor
+            while heap and (heap[0][1] == area or not valid(heap[0])):
+                heapq.heappop(heap)
+            if heap:
+                run = self._run(area, taken[area], heap[0][0])
+            else:
+                run = len(self.queues[area]) - taken[area]
+            count = min(n, run)
+            taken[area] += count
+            n -= count
+            self._push(area, taken[area])
+        return [(area, count, self.take(area, count)) for area, count in enumerate(taken) if count]
+
+
+class GlobalFIFOPolicy(PriorityPolicy):
+    """Remove the oldest items across all areas (heap merge of the per-area queue heads)."""
+
+
+class GlobalLIFOPolicy(PriorityPolicy):
+    """Remove the newest items across all areas (heap merge of the per-area queue tails)."""
+
+    def _key(self, area, taken=0):
+        item_id = self.queues[area].id_from_tail(taken)
+        return None if item_id is None else (0, -item_id)
+
+    def _run(self, area, taken, key):
+        return self.queues[area].count_newer(-key[1]) - taken
+
+    def take(self, area, count):
+        periods, _ = self.queues[area].pop_last_n(count)
+        self.index.move(area, -count)
+        return periods
+
+    def stored(self, area, count):
+        # Every store changes the newest item; rebuild once stale entries pile up
+        self._push(area)
+        if len(self.heap) > 4 * len(self.queues):
+            self.heap = []
+            for i in range(len(self.queues)):
+                self._push(i)
+
+
+class RoundRobinPolicy(AreaOrderPolicy):
+    """Take one item (the oldest) from each non-empty area in turn.
+
+    A removal of n items is done in bulk: every non-empty area gives the
+    same number of items, capped by what it holds, and the remainder goes
+    one each to the next areas in rotation. The rotation continues where
+    the previous removal stopped.
+    """
+
+    def __init__(self, queues, index):
+        super().__init__(queues, index)
+        self.next_area = 0
+
+    def remove(self, n):
+        num_areas = len(self.queues)
+        levels = [len(queue) for queue in self.queues]
+        counts = [0] * num_areas
+        # Areas in rotation order, starting at next_area
+        order = [(self.next_area + i) % num_areas for i in range(num_areas)]
+        last = None
+        while n > 0:
+            active = [area for area in order if levels[area] > counts[area]]
+            if not active:
+                break
+            if n < len(active):
+                # Remainder: one item each to the next areas in rotation
+                for area in active[:n]:
+                    counts[area] += 1
+                last = active[n - 1]
+                break
+            share = min(n // len(active), min(levels[a] - counts[a] for a in active))
+            for area in active:
+                counts[area] += share
+            n -= share * len(active)
+            last = active[-1]
+        if last is not None:
+            self.next_area = (last + 1) % num_areas
+        return [(area, count, self.take(area, count))
+                for area, count in enumerate(counts) if count]
+
+
+REMOVAL_POLICIES = {
+    'area': AreaOrderPolicy,
+    'fifo': GlobalFIFOPolicy,
+    'lifo': GlobalLIFOPolicy,
+    'round_robin': RoundRobinPolicy,
+}
+
+
+def removal_policy(policy, queues, index):
+    """Build a policy from a REMOVAL_POLICIES name or a callable(queues, index).
+
+    Use functools.partial(PriorityPolicy, priorities=[...]) for priority
+    classes per area.
+    """
+    if isinstance(policy, str):
+        if policy not in REMOVAL_POLICIES:
+            raise ValueError(f"unknown removal policy {policy!r}; "
+                             f"choose from {sorted(REMOVAL_POLICIES)}")
+        policy = REMOVAL_POLICIES[policy]
+    return policy(queues, index)
@@ -0,0 +1,79 @@
+import json
+from time import perf_counter
+
+
+class PhaseProfiler:
+    """Per-phase timers and counters for the simulation period loops.
+
+    Instrumented code calls begin() at the start of a period and lap(phase)
+    after each phase; a lap books the time since the previous lap (or
+    begin) to that phase. Code paths check ``profiler is not None`` first,
+    so runs without a profiler pay a single comparison per phase.
+
+    With trace=True every lap is also kept as a timed event, for
+    write_trace(); set trace=False on long runs to keep only the totals.
+    """
+
+    def __init__(self, trace=True):
+        self.trace = trace
+        self.totals = {}
+        self.counters = {}
+        self.events = []
+        self.replication = 0
+        self.period = None
+        self.origin = perf_counter()
+        self.last = self.origin
+
+    def begin(self, period=None):
+        """Start timing a period (None for work outside the period loop)."""
+        self.period = period
+        self.last = perf_counter()
+
+    def lap(self, phase):
+        now = perf_counter()
+        duration = now - self.last
+        total = self.totals.get(phase)
+        if total is None:
+            self.totals[phase] = [1, duration]
+        else:
+            total[0] += 1
+            total[1] += duration
+        if self.trace:
+            self.events.append((self.replication, self.period, phase, self.last - self.origin,
+                                duration))
+        self.last = now
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """DataFrame with calls, total and mean time and share of time per phase."""
+        import pandas as pd
+
+        total_time = sum(seconds for _, seconds in self.totals.values()) or 1.0
+        rows = [{'phase': phase, 'calls': calls, 'total_s': seconds,
+                 'mean_us': seconds / calls * 1e6, 'percent': seconds / total_time * 100}
+                for phase, (calls, seconds) in self.totals.items()]
+        frame = pd.DataFrame(rows, columns=['phase', 'calls', 'total_s', 'mean_us', 'percent'])
+        return frame.sort_values('total_s', ascending=False, ignore_index=True)
+
+    def trace_frame(self):
+        """One row per recorded lap: replication, period, phase, start_s, duration_s."""
+        import pandas as pd
+
+        return pd.DataFrame(self.events,
+                            columns=['replication', 'period', 'phase', 'start_s', 'duration_s'])
+
+    def write_trace(self, path):
+        """Write the laps as Chrome trace events (chrome://tracing, Perfetto, speedscope).
+
+        Each replication is drawn as its own thread; counters are attached
+        to the trace metadata.
+        """
+        events = [{'name': phase, 'cat': 'simulation', 'ph': 'X', 'pid': 0, 'tid': replication,
+                   'ts': start * 1e6, 'dur': duration * 1e6, 'args': {'period': period}}
+                  for replication, period, phase, start, duration in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'counters': self.counters}}, f)
+        return path
@@ -0,0 +1,123 @@
+import numpy as np
+
+from src.layout import DEFAULT_LAYOUT
+from src.simulation import sim_fifo_single
+
+# Values of the kind column that mark an inbound or an outbound ULD
+ARRIVAL_KINDS = ('in', 'inbound', 'arrival')
+REMOVAL_KINDS = ('out', 'outbound', 'departure', 'removal')
+
+
+def iter_event_chunks(path, time_column='time', kind_column='kind', chunk_rows=1_000_000):
+    """Yield (times, kinds) arrays of an event log, chunk_rows events at a time.
+
+    ``.npy`` files hold a structured array with time and kind fields and are
+    memory-mapped, ``.parquet`` files are read batch by batch (needs
+    pyarrow) and anything else is streamed as CSV, so only one chunk is in
+    memory at a time.
+    """
+    if str(path).endswith('.npy'):
+        events = np.load(path, mmap_mode='r')
+        for start in range(0, len(events), chunk_rows):
+            chunk = events[start:start + chunk_rows]
+            yield chunk[time_column], chunk[kind_column]
+    elif str(path).endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet traces requires pyarrow (pip install pyarrow)")
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_rows,
+                                          columns=[time_column, kind_column]):
+            yield (batch.column(time_column).to_numpy(zero_copy_only=False),
+                   batch.column(kind_column).to_numpy(zero_copy_only=False))
+    else:
+        import pandas as pd
+
+        for chunk in pd.read_csv(path, usecols=[time_column, kind_column], chunksize=chunk_rows):
+            yield chunk[time_column].to_numpy(), chunk[kind_column].to_numpy()
+
+
+def arrival_mask(kinds):
+    """True for inbound events: positive numbers or one of ARRIVAL_KINDS."""
+    kinds = np.asarray(kinds)
+    if kinds.dtype.kind in 'biuf':
+        return kinds > 0
+    lowered = np.char.lower(np.char.strip(kinds.astype(str)))
+    inbound = np.isin(lowered, ARRIVAL_KINDS)
+    unknown = ~inbound & ~np.isin(lowered, REMOVAL_KINDS)
+    if unknown.any():
+        raise ValueError(f"Unknown event kind {kinds[unknown][0]!r}")
+    return inbound
+
+
+def _ticks(times, period_length):
+    # Integer nanoseconds for timestamps (period_length a string or timedelta), else as given
+    if isinstance(period_length, (int, float, np.integer, np.floating)):
+        return np.asarray(times, dtype=float), float(period_length)
+    import pandas as pd
+
+    times = pd.to_datetime(times).to_numpy().astype('datetime64[ns]').astype(np.int64)
+    return times, pd.Timedelta(period_length).value
+
+
+def _start_tick(start, period_length):
+    if start is None or isinstance(period_length, (int, float, np.integer, np.floating)):
+        return start
+    import pandas as pd
+
+    return pd.Timestamp(start).value
+
+
+def period_counts(path, period_length, start=None, num_periods=None, time_column='time',
+                  kind_column='kind', chunk_rows=1_000_000):
+    """Bucket an event log into per-period arrival and removal counts.
+
+    period_length is a number in the units of a numeric time column, or a
+    duration such as '1h' for timestamp columns. Periods start at ``start``
+    (default: the first event; logs are expected in time order). Events
+    before start, or after num_periods periods when num_periods is given,
+    are ignored. Each chunk is bucketed with a single bincount, so the log
+    never has to fit in memory.
+    """
+    arrivals = np.zeros(num_periods or 0, dtype=np.int64)
+    removals = np.zeros(num_periods or 0, dtype=np.int64)
+    origin = _start_tick(start, period_length)
+
+    for times, kinds in iter_event_chunks(path, time_column, kind_column, chunk_rows):
+        if len(times) == 0:
+            continue
+        ticks, length = _ticks(times, period_length)
+        if origin is None:
+            origin = ticks[0]
+        periods = (ticks - origin) // length
+        inbound = arrival_mask(kinds)
+        keep = periods >= 0
+        if num_periods is not None:
+            keep &= periods < num_periods
+        periods = periods[keep].astype(np.int64)
+        inbound = inbound[keep]
+        if len(periods) == 0:
+            continue
+
+        size = max(len(arrivals), int(periods.max()) + 1)
+        if size > len(arrivals):
+            arrivals = np.concatenate([arrivals, np.zeros(size - len(arrivals), dtype=np.int64)])
+            removals = np.concatenate([removals, np.zeros(size - len(removals), dtype=np.int64)])
+        arrivals += np.bincount(periods[inbound], minlength=size)
+        removals += np.bincount(periods[~inbound], minlength=size)
+
+    return arrivals, removals
+
+
+def sim_fifo_replay(path, period_length, start=None, num_periods=None, return_dwell=False,
+                    observer=None, layout=DEFAULT_LAYOUT, **read_options):
+    """Drive sim_fifo_single from a recorded event log instead of Poisson draws.
+
+    Arrivals that find every area full are rejected and removal requests
+    beyond the stored items lapse, as in the simulated model. read_options
+    (time_column, kind_column, chunk_rows) are passed to period_counts.
+    """
+    demand = period_counts(path, period_length, start, num_periods, **read_options)
+    return sim_fifo_single(return_dwell=return_dwell, observer=observer, layout=layout,
+                           demand=demand)
@@ -0,0 +1,158 @@
+import re
+
+import numpy as np
+
+from src.engine import occupancy_frame
+
+AXES = {'simulation': 0, 'period': 1, 'area': 2}
+
+
+def _axis(axis):
+    if axis is None or isinstance(axis, (int, np.integer)):
+        return axis
+    if isinstance(axis, str):
+        return AXES[axis]
+    return tuple(_axis(a) for a in axis)
+
+
+class SimulationResults:
+    """simFIFO occupancy as one contiguous (simulations x periods x areas) array.
+
+    The array uses the smallest integer type that holds the capacities
+    (uint8 for areas of up to 255 slots), so it is 8x smaller than the
+    int64 columns of the long DataFrame. simulation(), area() and period()
+    return views without scanning anything, reductions run on the array,
+    and to_dataframe() builds the long DataFrame only when asked.
+
+    Any (simulations x periods x areas) array works, including the memmap
+    returned by src.sink.load_results, which is wrapped without copying.
+    """
+
+    def __init__(self, occupancy, capacities=None):
+        occupancy = np.asarray(occupancy)
+        if occupancy.ndim != 3:
+            raise ValueError("occupancy must be a (simulations x periods x areas) array")
+        if capacities is not None:
+            capacities = tuple(int(c) for c in capacities)
+            if len(capacities) != occupancy.shape[2]:
+                raise ValueError("capacities must have one entry per area")
+            dtype = np.min_scalar_type(max(capacities))
+            if occupancy.dtype.itemsize > dtype.itemsize:
+                occupancy = occupancy.astype(dtype)
+        if not isinstance(occupancy, np.memmap):
+            occupancy = np.ascontiguousarray(occupancy)
+        self.occupancy = occupancy
+        self.capacities = capacities
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, frame, capacities=None, columns=None):
+        """Pack a long simFIFO DataFrame (one row per simulation and period)."""
+        if columns is None:
+            columns = sorted((c for c in frame.columns if re.fullmatch(r'area\d+_occupancy', c)),
+                             key=lambda c: int(c[4:-10]))
+        simulation = frame['simulation'].to_numpy()
+        period = frame['period'].to_numpy()
+        values = frame[columns].to_numpy()
+        order = np.lexsort((period, simulation))
+        if not np.array_equal(order, np.arange(len(order))):
+            simulation, values = simulation[order], values[order]
+        num_simulations = len(np.unique(simulation))
+        if num_simulations == 0 or len(values) % num_simulations:
+            raise ValueError("every simulation must have the same number of periods")
+        occupancy = values.reshape(num_simulations, -1, len(columns))
+        if capacities is None:
+            dtype = np.min_scalar_type(int(occupancy.max(initial=0)))
+            occupancy = occupancy.astype(dtype)
+        return cls(occupancy, capacities)
+
+    @property
+    def shape(self):
+        return self.occupancy.shape
+
+    @property
+    def num_simulations(self):
+        return self.occupancy.shape[0]
+
+    @property
+    def num_periods(self):
+        return self.occupancy.shape[1]
+
+    @property
+    def num_areas(self):
+        return self.occupancy.shape[2]
+
+    @property
+    def nbytes(self):
+        return self.occupancy.nbytes
+
+    @property
+    def columns(self):
+        return [f'area{i+1}_occupancy' for i in range(self.num_areas)]
+
+    def __len__(self):
+        return self.num_simulations
+
+    def __iter__(self):
+        return iter(self.occupancy)
+
+    def __getitem__(self, key):
+        """Index the underlying array, e.g. results[3, 10:20, 0]."""
+        return self.occupancy[key]
+
+    def __repr__(self):
+        return (f'SimulationResults({self.num_simulations} simulations x {self.num_periods} '
+                f'periods x {self.num_areas} areas, {self.occupancy.dtype})')
+
+    def simulation(self, i):
+        """(periods x areas) occupancy of replication i."""
+        return self.occupancy[i]
+
+    def area(self, j):
+        """(simulations x periods) occupancy of area j (0-based)."""
+        return self.occupancy[:, :, j]
+
+    def period(self, t):
+        """(simulations x areas) end-of-period occupancy of period t."""
+        return self.occupancy[:, t]
+
+    def total(self):
+        """(simulations x periods) total occupancy over all areas."""
+        return self.occupancy.sum(axis=2, dtype=np.int64)
+
+    def mean(self, axis='simulation'):
+        """Mean occupancy over an axis name ('simulation', 'period', 'area') or names."""
+        return self.occupancy.mean(axis=_axis(axis))
+
+    def std(self, axis='simulation', ddof=1):
+        return self.occupancy.std(axis=_axis(axis), ddof=ddof)
+
+    def quantile(self, q, axis='simulation'):
+        return np.quantile(self.occupancy, q, axis=_axis(axis))
+
+    def utilization(self):
+        """Occupancy as a fraction of each area's capacity (float array)."""
+        if self.capacities is None:
+            raise ValueError("utilization needs the area capacities")
+        return self.occupancy / np.asarray(self.capacities)
+
+    def frame(self, simulation=None):
+        """Wide DataFrame view: one occupancy column per area.
+
+        For one simulation it is indexed by period; otherwise by
+        (simulation, period). Both wrap the array itself, no copy is made.
+        """
+        import pandas as pd
+
+        if simulation is not None:
+            return pd.DataFrame(self.occupancy[simulation], columns=self.columns, copy=False)
+        index = pd.MultiIndex.from_product([range(self.num_simulations), range(self.num_periods)],
+                                           names=['simulation', 'period'])
+        return pd.DataFrame(self.occupancy.reshape(-1, self.num_areas), index=index,
+                            columns=self.columns, copy=False)
+
+    def to_dataframe(self):
+        """simFIFO's long DataFrame (period, areaN_occupancy..., simulation), built once."""
+        if self._frame is None:
+            self._frame = occupancy_frame(self.occupancy)
+        return self._frame
@@ -0,0 +1,119 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.engine import (AREA_CAPACITIES, ARRIVAL_MEAN, REMOVAL_MEAN,
+                        occupancy_frame, seed_sequence, simulate_chunk)
+from src.parallel import chunk_bounds
+
+
+def iter_chunks(num_simulations=1000, num_periods=100, chunk_size=1000, seed=None,
+                n_jobs=1, capacities=AREA_CAPACITIES,
+                arrival_mean=ARRIVAL_MEAN, removal_mean=REMOVAL_MEAN):
+    """Yield (start, occupancy) for consecutive chunks of replications.
+
+    occupancy is a (chunk x periods x areas) array. With n_jobs > 1 at most
+    2 * n_jobs chunks are in flight, so memory stays bounded however slowly
+    the consumer drains the generator.
+    """
+    seed = seed_sequence(seed)
+    bounds = chunk_bounds(num_simulations, chunk_size)
+
+    if n_jobs == 1:
+        for start, stop in bounds:
+            yield start, simulate_chunk(seed, start, stop, num_periods, capacities,
+                                        arrival_mean, removal_mean)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        pending = deque()
+        for start, stop in bounds:
+            pending.append((start, pool.submit(simulate_chunk, seed, start, stop, num_periods,
+                                               capacities, arrival_mean, removal_mean)))
+            if len(pending) >= 2 * n_jobs:
+                start, future = pending.popleft()
+                yield start, future.result()
+        while pending:
+            start, future = pending.popleft()
+            yield start, future.result()
+
+
+def iter_sim_fifo(num_simulations=1000, num_periods=100, chunk_size=1000, seed=None,
+                  n_jobs=1, **params):
+    """Yield simFIFO-shaped DataFrames of at most chunk_size replications each."""
+    for start, occupancy in iter_chunks(num_simulations, num_periods, chunk_size, seed,
+                                        n_jobs, **params):
+        # Same int64 columns as simFIFO so chunks can be concatenated with its output
+        chunk_df = occupancy_frame(occupancy.astype(np.int64))
+        chunk_df['simulation'] += start
+        yield chunk_df
+
+
+def write_results(path, num_simulations=1000, num_periods=100, chunk_size=1000, seed=None,
+                  n_jobs=1, capacities=AREA_CAPACITIES, live=None, **params):
+    """Stream replications to disk chunk by chunk.
+
+    A ``.npy`` path gets a (simulations x periods x areas) memmap in the
+    smallest sufficient integer type; a ``.parquet`` path gets simFIFO's long
+    table with one row group per chunk (requires pyarrow). Progress is
+    published to ``live`` (a src.live.LiveServer) after every chunk.
+    """
+    chunks = iter_chunks(num_simulations, num_periods, chunk_size, seed, n_jobs,
+                         capacities=capacities, **params)
+    metrics = None
+    if live is not None:
+        from src.live import ChunkMetrics
+        metrics = ChunkMetrics(live, num_simulations, num_periods)
+
+    if str(path).endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("writing .parquet results requires pyarrow; use a .npy path instead")
+        writer = None
+        try:
+            for start, occupancy in chunks:
+                chunk_df = occupancy_frame(occupancy)
+                chunk_df['simulation'] += start
+                table = pa.Table.from_pandas(chunk_df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                if metrics is not None:
+                    metrics.add(occupancy)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    dtype = np.min_scalar_type(max(capacities))
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype,
+                                    shape=(num_simulations, num_periods, len(capacities)))
+    for start, occupancy in chunks:
+        out[start:start + len(occupancy)] = occupancy
+        out.flush()
+        if metrics is not None:
+            metrics.add(occupancy)
+    del out
+    return path
+
+
+def load_results(path):
+    """Open results written by write_results without loading them into memory.
+
+    ``.npy`` files come back as a read-only (simulations x periods x areas)
+    memmap. ``.parquet`` files come back as a pyarrow ParquetFile: read one
+    chunk at a time with ``read_row_group(i).to_pandas()`` or
+    ``iter_batches()``, since a Parquet table cannot be memory-mapped as a
+    DataFrame.
+    """
+    if str(path).endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("reading .parquet results requires pyarrow")
+        return pq.ParquetFile(path)
+    return np.load(path, mmap_mode='r')
+
@@ -0,0 +1,196 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from src.engine import AREA_CAPACITIES
+from src.sink import iter_chunks
+
+
+def z_value(confidence=0.95):
+    """Two-sided standard normal critical value."""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+class RunningStats:
+    """Welford mean/variance over replications, elementwise over an array shape.
+
+    update() takes a whole batch (replications along axis 0) and merges it
+    with Chan's parallel formula, so no per-replication Python loop is needed.
+    """
+
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, batch):
+        batch = np.asarray(batch, dtype=float)
+        n = len(batch)
+        if n == 0:
+            return
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    def variance(self):
+        """Sample variance (ddof=1); NaN until two observations are in."""
+        if self.count < 2:
+            return np.full(self.mean.shape, np.nan)
+        return self.m2 / (self.count - 1)
+
+    def half_width(self, confidence=0.95):
+        """Normal-approximation confidence-interval half-width of the mean."""
+        return z_value(confidence) * np.sqrt(self.variance() / self.count)
+
+
+class P2Quantile:
+    """Streaming P-square quantile estimate (Jain & Chlamtac), elementwise.
+
+    Five markers per element are kept, so memory is constant in the number
+    of observations; each update advances every element with array operations.
+    """
+
+    def __init__(self, shape, p):
+        self.p = p
+        self.count = 0
+        self.heights = np.zeros((5,) + tuple(shape))
+        self.positions = np.tile(np.arange(1.0, 6.0).reshape((5,) + (1,) * len(shape)),
+                                 (1,) + tuple(shape))
+        self.desired = np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0])
+        self.increments = np.array([0, p / 2, p, (1 + p) / 2, 1.0])
+
+    def update(self, x):
+        x = np.asarray(x, dtype=float)
+        q, n = self.heights, self.positions
+
+        # The first five observations just initialise the (sorted) markers
+        if self.count < 5:
+            q[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                q.sort(axis=0)
+            return
+        self.count += 1
+
+        # Cell k such that q[k] <= x < q[k+1], extending the extremes if needed
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        k = np.clip((x[None] >= q[1:4]).sum(axis=0), 0, 3)
+        n += np.arange(5).reshape((5,) + (1,) * x.ndim) > k[None]
+
+        expected = (self.desired + self.increments * (self.count - 5)).reshape(
+            (5,) + (1,) * x.ndim)
+        for i in (1, 2, 3):
+            d = expected[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not move.any():
+                continue
+            step = np.sign(d)
+            parabolic = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+            # Fall back to linear interpolation when the parabola leaves the bracket
+            neighbour = np.where(step > 0, q[i + 1], q[i - 1])
+            neighbour_n = np.where(step > 0, n[i + 1], n[i - 1])
+            linear = q[i] + step * (neighbour - q[i]) / (neighbour_n - n[i])
+            ok = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            q[i] = np.where(move, np.where(ok, parabolic, linear), q[i])
+            n[i] = np.where(move, n[i] + step, n[i])
+
+    def value(self):
+        if self.count < 5:
+            # Too few observations for the markers: use the exact sample quantile
+            if self.count == 0:
+                return np.full(self.heights.shape[1:], np.nan)
+            return np.quantile(self.heights[:self.count], self.p, axis=0)
+        return self.heights[2].copy()
+
+
+class OccupancyAccumulator:
+    """Running per-period, per-area occupancy statistics across replications."""
+
+    def __init__(self, num_periods, num_areas=len(AREA_CAPACITIES),
+                 quantiles=(0.05, 0.5, 0.95), metric='total'):
+        self.num_periods = num_periods
+        self.num_areas = num_areas
+        self.metric = metric
+        self.stats = RunningStats((num_periods, num_areas))
+        self.metric_stats = RunningStats(num_periods)
+        self.sketches = {p: P2Quantile((num_periods, num_areas), p) for p in quantiles}
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    def update(self, occupancy):
+        """Add a (replications x periods x areas) batch."""
+        self.stats.update(occupancy)
+        self.metric_stats.update(metric_series(occupancy, self.metric))
+        for sketch in self.sketches.values():
+            for replication in occupancy:
+                sketch.update(replication)
+
+    def half_width(self, confidence=0.95):
+        """Widest per-period CI half-width of the mean of the tracked metric."""
+        return np.nanmax(self.metric_stats.half_width(confidence))
+
+    def summary(self):
+        """Long DataFrame with one row per period and area."""
+        import pandas as pd
+
+        periods, areas = np.meshgrid(np.arange(self.num_periods),
+                                     np.arange(1, self.num_areas + 1), indexing='ij')
+        data = {
+            'period': periods.ravel(),
+            'area': areas.ravel(),
+            'mean': self.stats.mean.ravel(),
+            'var': self.stats.variance().ravel(),
+        }
+        for p, sketch in self.sketches.items():
+            data[f'q{p * 100:g}'] = sketch.value().ravel()
+        data['replications'] = self.count
+        return pd.DataFrame(data)
+
+
+def metric_series(occupancy, metric):
+    """Per-period metric for each replication: an area column or 'total'."""
+    if metric == 'total':
+        return occupancy.sum(axis=2)
+    area = int(metric.replace('area', '').replace('_occupancy', ''))
+    return occupancy[:, :, area - 1]
+
+
+def sim_fifo_online(num_periods=100, target_half_width=None, metric='total',
+                    confidence=0.95, min_simulations=30, max_simulations=1000,
+                    batch_size=100, seed=None, n_jobs=1, quantiles=(0.05, 0.5, 0.95),
+                    capacities=AREA_CAPACITIES, live=None, **params):
+    """Accumulate occupancy statistics instead of storing every replication.
+
+    With target_half_width set, replications run in batches until the widest
+    per-period confidence-interval half-width of the mean ``metric``
+    ('total' or e.g. 'area2_occupancy') drops below the target, or until
+    max_simulations is reached. After every batch the replication count,
+    current half-width and mean ``metric`` per period are published to
+    ``live`` (a src.live.LiveServer), if given.
+    """
+    accumulator = OccupancyAccumulator(num_periods, len(capacities), quantiles, metric)
+
+    chunks = iter_chunks(max_simulations, num_periods, batch_size, seed, n_jobs,
+                         capacities=capacities, **params)
+    for _, occupancy in chunks:
+        accumulator.update(occupancy)
+        if live is not None:
+            live.publish({'replications': accumulator.count, 'max_simulations': max_simulations,
+                          'half_width': accumulator.half_width(confidence),
+                          'target_half_width': target_half_width,
+                          'mean_' + metric: accumulator.metric_stats.mean})
+        if (target_half_width is not None and accumulator.count >= min_simulations
+                and accumulator.half_width(confidence) <= target_half_width):
+            chunks.close()
+            break
+
+    return accumulator
@@ -0,0 +1,259 @@
+import hashlib
+import itertools
+from itertools import repeat
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.checkpoint import _write_atomic
+from src.des import sim_fifo_des
+from src.encoding import json_default
+from src.engine import (AREA_CAPACITIES, ARRIVAL_MEAN, MODEL_VERSION, REMOVAL_MEAN,
+                        replication_seeds, simulate_chunk)
+from src.layout import StorageLayout
+from src.parallel import chunk_bounds
+from src.sink import iter_chunks
+
+
+def parameter_grid(grid):
+    """Expand {'name': [values, ...]} into a list of parameter dicts (cartesian product)."""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def cache_key(params, seed, num_simulations, num_periods, engine):
+    """Content hash of everything that determines a sweep point's results."""
+    payload = {
+        'params': params,
+        'seed': seed,
+        'num_simulations': num_simulations,
+        'num_periods': num_periods,
+        'engine': engine,
+        'model_version': MODEL_VERSION,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=json_default)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """Directory of ``<key>.npz`` result files with size/age based eviction.
+
+    Files are written atomically. A cache hit refreshes the file's mtime, so
+    evicting by oldest mtime first is least-recently-used eviction.
+    """
+
+    def __init__(self, directory='.sim_cache', max_bytes=None, max_age=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def get(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+            os.remove(path)
+            return None
+        os.utime(path)
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def put(self, key, arrays):
+        _write_atomic(self.path(key), lambda f: np.savez_compressed(f, **arrays))
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every cached file, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Drop entries older than max_age, then oldest entries until under max_bytes."""
+        entries = self.entries()
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for mtime, _, path in entries:
+                if mtime < cutoff:
+                    os.remove(path)
+            entries = [entry for entry in entries if entry[0] >= cutoff]
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+
+
+def _run_batch_point(params, seed, num_simulations, num_periods, n_jobs):
+    capacities = tuple(params.get('capacities', AREA_CAPACITIES))
+    occupancy = np.empty((num_simulations, num_periods, len(capacities)),
+                         dtype=np.min_scalar_type(max(capacities)))
+    chunk_size = max(1, num_simulations // (4 * n_jobs))
+    chunks = iter_chunks(num_simulations, num_periods, chunk_size, seed=seed, n_jobs=n_jobs,
+                         capacities=capacities,
+                         arrival_mean=params.get('arrival_mean', ARRIVAL_MEAN),
+                         removal_mean=params.get('removal_mean', REMOVAL_MEAN))
+    for start, chunk in chunks:
+        occupancy[start:start + len(chunk)] = chunk
+    return {'occupancy': occupancy}
+
+
+def _batch_chunk(params, seed, start, stop, num_periods):
+    capacities = tuple(params.get('capacities', AREA_CAPACITIES))
+    return {'occupancy': simulate_chunk(seed, start, stop, num_periods, capacities,
+                                        params.get('arrival_mean', ARRIVAL_MEAN),
+                                        params.get('removal_mean', REMOVAL_MEAN))}
+
+
+def _des_params(params):
+    params = dict(params)
+    if 'capacities' in params:
+        params['layout'] = StorageLayout(params.pop('capacities'))
+    return params
+
+
+def _des_replication(seed_seq, num_periods, params):
+    return sim_fifo_des(num_periods, seed=seed_seq, **params)
+
+
+def _des_arrays(runs):
+    return {
+        'occupancy': np.stack([run['occupancy'] for run in runs]),
+        'loading_utilization': np.array([run['loading_utilization'] for run in runs]),
+        'unloading_utilization': np.array([run['unloading_utilization'] for run in runs]),
+        'loading_wait': np.array([run['loading_wait'].mean() for run in runs]),
+        'unloading_wait': np.array([run['unloading_wait'].mean() for run in runs]),
+        'rejected': np.array([run['rejected'] for run in runs]),
+    }
+
+
+def _des_chunk(params, seed, start, stop, num_periods):
+    params = _des_params(params)
+    return _des_arrays([_des_replication(seed_seq, num_periods, params)
+                        for seed_seq in replication_seeds(seed, start, stop)])
+
+
+def _run_des_point(params, seed, num_simulations, num_periods, n_jobs):
+    params = _des_params(params)
+    seeds = replication_seeds(seed, 0, num_simulations)
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            runs = list(pool.map(_des_replication, seeds, repeat(num_periods), repeat(params)))
+    else:
+        runs = [_des_replication(seed_seq, num_periods, params) for seed_seq in seeds]
+    return _des_arrays(runs)
+
+
+SWEEP_ENGINES = {
+    'batch': _run_batch_point,
+    'des': _run_des_point,
+}
+
+# Replications start..stop-1 of one point, the work unit of distributed sweeps (src.distributed)
+SWEEP_CHUNKS = {
+    'batch': _batch_chunk,
+    'des': _des_chunk,
+}
+
+
+def sweep_tasks(points, seed, num_simulations, num_periods, engine, chunk_size):
+    """Task dicts covering every replication of every point, chunk_size at a time.
+
+    seed is resolved to its SeedSequence entropy so every worker derives the
+    same per-replication streams as a local run.
+    """
+    entropy = np.random.SeedSequence(seed).entropy
+    return [{'point': i, 'engine': engine, 'params': params, 'seed': entropy,
+             'start': start, 'stop': stop, 'num_periods': num_periods}
+            for i, params in enumerate(points)
+            for start, stop in chunk_bounds(num_simulations, chunk_size)]
+
+
+def summarize_point(arrays):
+    """Scalar summary of a sweep point: means over replications and periods."""
+    occupancy = arrays['occupancy']
+    summary = {f'area{i+1}_mean': occupancy[:, :, i].mean() for i in range(occupancy.shape[2])}
+    summary['total_mean'] = occupancy.sum(axis=2).mean()
+    for name, values in arrays.items():
+        if name != 'occupancy':
+            summary[f'{name}_mean'] = values.mean()
+    return summary
+
+
+def run_sweep(grid, num_simulations=100, num_periods=100, seed=0, engine='batch',
+              cache_dir='.sim_cache', max_bytes=None, max_age=None, n_jobs=1, live=None,
+              coordinator=None, chunk_size=None):
+    """Run every point of a parameter grid, reusing cached points.
+
+    grid maps parameter names to lists of values: 'arrival_mean',
+    'removal_mean' and 'capacities' for the batch engine, plus forklift counts
+    and timing parameters of sim_fifo_des for engine='des'. Only points whose
+    content hash (parameters, seed, horizon, replications, engine, model
+    version) is missing from the cache are simulated. Returns one summary row
+    per point; the full arrays are available from ResultCache(cache_dir).get(key).
+    seed=None gives fresh random results every call, so they are not cached.
+    Progress and the latest row are published to ``live`` (a src.live.LiveServer)
+    after every point.
+
+    With a started src.distributed.Coordinator, the missing points are split
+    into tasks of chunk_size replications and run on its workers instead;
+    results are identical to a local run with the same seed.
+    """
+    import pandas as pd
+
+    run_point = SWEEP_ENGINES[engine]
+    cache = ResultCache(cache_dir, max_bytes=max_bytes, max_age=max_age)
+    rows = []
+    points = parameter_grid(grid)
+    start = time.time()
+    keys = [cache_key(params, seed, num_simulations, num_periods, engine) for params in points]
+    use_cache = seed is not None
+
+    # Distributed mode: run every missing point's chunks on the coordinator's workers at once
+    computed = {}
+    if coordinator is not None:
+        cache.evict()
+        missing = [i for i, key in enumerate(keys)
+                   if not use_cache or not os.path.exists(cache.path(key))]
+        if chunk_size is None:
+            chunk_size = max(1, -(-num_simulations // (4 * max(1, coordinator.num_workers))))
+        tasks = sweep_tasks([points[i] for i in missing], seed, num_simulations, num_periods,
+                            engine, chunk_size)
+        chunks = {}
+        for task, arrays in zip(tasks, coordinator.map(tasks)):
+            chunks.setdefault(missing[task['point']], []).append(arrays)
+        for i, parts in chunks.items():
+            computed[i] = {name: np.concatenate([part[name] for part in parts])
+                           for name in parts[0]}
+
+    for i, params in enumerate(points):
+        key = keys[i]
+        arrays = computed.get(i)
+        cached = False
+        if arrays is None and use_cache:
+            arrays = cache.get(key)
+            cached = arrays is not None
+        if arrays is None:
+            arrays = run_point(params, seed, num_simulations, num_periods, n_jobs)
+        if use_cache and not cached:
+            cache.put(key, arrays)
+        rows.append({**{name: value if np.isscalar(value) else tuple(value)
+                        for name, value in params.items()},
+                     'key': key, 'cached': cached, **summarize_point(arrays)})
+        if live is not None:
+            live.publish({'points_done': len(rows), 'points': len(points),
+                          'elapsed': time.time() - start, 'latest': rows[-1]})
+    return pd.DataFrame(rows)
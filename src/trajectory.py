@@ -0,0 +1,221 @@
+import numpy as np
+
+from src.fifo import AreaFIFO
+from src.layout import DEFAULT_LAYOUT, FirstFitIndex
+
+
+def forklift_targets(targets, first_item, count, area_num, items_per_trip=1):
+    """Point every forklift that moves one of ``count`` items at ``area_num``.
+
+    Item number n (1-based, running within the period) goes to forklift
+    (n // items_per_trip) % num_forklifts, so each forklift ends the period at
+    the area of the last item it carried.
+    """
+    num_forklifts = len(targets)
+    if count <= 0:
+        return
+    numbers = np.arange(first_item + 1, first_item + count + 1)
+    indices = np.unique((numbers // items_per_trip) % num_forklifts)
+    targets[indices] = area_num
+
+
+class VisualModel:
+    """The forklift model behind sim_fifo_single_visual, one period per step().
+
+    step(frame) advances the model and hands a record of the period to every
+    callable in ``observers`` (e.g. a TrajectoryRecorder), then returns it.
+    It makes the same random draws, in the same order, as the original
+    animated model.
+    """
+
+    def __init__(self, num_loading_forklifts=3, num_unloading_forklifts=2,
+                 mean_trips_per_period=10, std_trips_per_period=2,
+                 mean_items_per_trip=5, std_items_per_trip=1,
+                 rng=None, layout=DEFAULT_LAYOUT, profiler=None):
+        self.num_loading_forklifts = num_loading_forklifts
+        self.num_unloading_forklifts = num_unloading_forklifts
+        self.mean_trips_per_period = mean_trips_per_period
+        self.std_trips_per_period = std_trips_per_period
+        self.mean_items_per_trip = mean_items_per_trip
+        self.std_items_per_trip = std_items_per_trip
+        self.rng = np.random if rng is None else rng
+        self.layout = layout
+        self.profiler = profiler
+        self.observers = []
+
+        self.areas = {num: dict(area, items=AreaFIFO(area['capacity']))
+                      for num, area in layout.areas().items()}
+        self.index = FirstFitIndex(layout.capacities)
+        # Area each forklift is drawn at (0 = idle); unassigned forklifts stay put
+        self.loading_targets = np.zeros(num_loading_forklifts, dtype=np.int64)
+        self.unloading_targets = np.zeros(num_unloading_forklifts, dtype=np.int64)
+
+    def params(self, num_periods):
+        """The parameters a renderer needs, as stored in a trajectory's 'params'."""
+        return {
+            'areas': self.layout.areas(),
+            'num_periods': num_periods,
+            'num_loading_forklifts': self.num_loading_forklifts,
+            'num_unloading_forklifts': self.num_unloading_forklifts,
+            'mean_trips_per_period': self.mean_trips_per_period,
+            'mean_items_per_trip': self.mean_items_per_trip,
+        }
+
+    def step(self, frame):
+        rng = self.rng
+        areas = self.areas
+        index = self.index
+        profiler = self.profiler
+        num_areas = len(areas)
+        loading_targets = self.loading_targets
+        unloading_targets = self.unloading_targets
+        added = np.zeros(num_areas, dtype=np.int64)
+        removed = np.zeros(num_areas, dtype=np.int64)
+
+        # Generate random trips and items per trip
+        trips_per_period = max(1, int(rng.normal(self.mean_trips_per_period,
+                                                 self.std_trips_per_period)))
+        items_per_trip = max(1, int(rng.normal(self.mean_items_per_trip,
+                                               self.std_items_per_trip)))
+        unloading_capacity_per_period = (self.num_unloading_forklifts * trips_per_period
+                                         * items_per_trip)
+
+        # Use Poisson distribution with mean of 22 ULDs per hour
+        new_items = rng.poisson(22)
+        items_to_remove = rng.poisson(20)
+        if profiler is not None:
+            profiler.lap('draws')
+
+        active_loading_areas = []
+        active_unloading_areas = []
+
+        # Process removals, with random delays and processing efficiency
+        removed_items = 0
+        if items_to_remove > 0:
+            delay_probability = 0.3
+            processing_efficiency = rng.uniform(0.6, 1.0)
+            actual_items_to_remove = int(items_to_remove * processing_efficiency)
+
+            for area_num in range(1, num_areas + 1):
+                if len(areas[area_num]['items']) > 0:
+                    if rng.random() < delay_probability:
+                        continue
+                    count = min(
+                        actual_items_to_remove - removed_items,
+                        len(areas[area_num]['items']),
+                        int(unloading_capacity_per_period * processing_efficiency) // num_areas
+                    )
+                    if count > 0:
+                        areas[area_num]['items'].pop_n(count)
+                        index.move(area_num - 1, -count)
+                        forklift_targets(unloading_targets, removed_items, count,
+                                          area_num, items_per_trip)
+                        active_unloading_areas.append(area_num)
+                        removed_items += count
+                        removed[area_num - 1] = count
+                    if removed_items >= actual_items_to_remove:
+                        break
+        if profiler is not None:
+            profiler.lap('removal')
+            profiler.count('items_removed', removed_items)
+            profiler.count('areas_touched', len(active_unloading_areas))
+
+        # Process additions first-fit, without forklift capacity limits
+        added_items = 0
+        for area, count in index.store(new_items):
+            area_num = area + 1
+            areas[area_num]['items'].push_n(frame, added_items, count)
+            forklift_targets(loading_targets, added_items, count, area_num)
+            active_loading_areas.append(area_num)
+            added_items += count
+            added[area_num - 1] = count
+        if profiler is not None:
+            profiler.lap('storage')
+            profiler.count('items_stored', added_items)
+            profiler.count('rejected', new_items - added_items)
+            profiler.count('areas_touched', len(active_loading_areas))
+
+        # Only as many forklifts as active areas are drawn
+        loading_targets[len(active_loading_areas):] = 0
+        unloading_targets[len(active_unloading_areas):] = 0
+
+        next_area = index.first_free()
+        record = {
+            'period': frame,
+            'occupancy': [len(areas[a]['items']) for a in range(1, num_areas + 1)],
+            'added': added,
+            'removed': removed,
+            'new_items': new_items,
+            'items_to_remove': items_to_remove,
+            'unloading_capacity': unloading_capacity_per_period,
+            'trips': trips_per_period,
+            'items_per_trip': items_per_trip,
+            'loading_util': len(active_loading_areas) / self.num_loading_forklifts * 100,
+            'unloading_util': len(active_unloading_areas) / self.num_unloading_forklifts * 100,
+            'loading_forklifts': loading_targets.copy(),
+            'unloading_forklifts': unloading_targets.copy(),
+            'next_area': 0 if next_area is None else next_area + 1,
+        }
+        for observer in self.observers:
+            observer(record)
+        return record
+
+
+class TrajectoryRecorder:
+    """Observer that writes VisualModel records into preallocated per-period arrays."""
+
+    def __init__(self, num_periods, num_areas, num_loading_forklifts, num_unloading_forklifts):
+        self.trajectory = {
+            'occupancy': np.zeros((num_periods, num_areas), dtype=np.int64),
+            'added': np.zeros((num_periods, num_areas), dtype=np.int64),
+            'removed': np.zeros((num_periods, num_areas), dtype=np.int64),
+            'new_items': np.zeros(num_periods, dtype=np.int64),
+            'items_to_remove': np.zeros(num_periods, dtype=np.int64),
+            'unloading_capacity': np.zeros(num_periods, dtype=np.int64),
+            'trips': np.zeros(num_periods, dtype=np.int64),
+            'items_per_trip': np.zeros(num_periods, dtype=np.int64),
+            'loading_util': np.zeros(num_periods),
+            'unloading_util': np.zeros(num_periods),
+            # Area each forklift is drawn at (0 = idle)
+            'loading_forklifts': np.zeros((num_periods, num_loading_forklifts), dtype=np.int64),
+            'unloading_forklifts': np.zeros((num_periods, num_unloading_forklifts),
+                                            dtype=np.int64),
+            'next_area': np.zeros(num_periods, dtype=np.int64),
+        }
+
+    def __call__(self, record):
+        frame = record['period']
+        for key, values in self.trajectory.items():
+            values[frame] = record[key]
+
+
+def visual_trajectory(num_periods=100,
+                      num_loading_forklifts=3,
+                      num_unloading_forklifts=2,
+                      mean_trips_per_period=10,
+                      std_trips_per_period=2,
+                      mean_items_per_trip=5,
+                      std_items_per_trip=1,
+                      rng=None,
+                      layout=DEFAULT_LAYOUT,
+                      observer=None):
+    """Run the sim_fifo_single_visual model headlessly and return its trajectory.
+
+    The result is a dict of per-period arrays plus the parameters needed to
+    render it. observer, if given, also receives every period record.
+    """
+    model = VisualModel(num_loading_forklifts, num_unloading_forklifts,
+                        mean_trips_per_period, std_trips_per_period,
+                        mean_items_per_trip, std_items_per_trip, rng=rng, layout=layout)
+    recorder = TrajectoryRecorder(num_periods, len(layout), num_loading_forklifts,
+                                  num_unloading_forklifts)
+    model.observers.append(recorder)
+    if observer is not None:
+        model.observers.append(observer)
+    for frame in range(num_periods):
+        model.step(frame)
+
+    trajectory = recorder.trajectory
+    trajectory['areas'] = model.areas
+    trajectory['params'] = model.params(num_periods)
+    return trajectory
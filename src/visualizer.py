@@ -1,32 +1,21 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib.animation as animation
+from src.layout import DEFAULT_LAYOUT
+from src.results import SimulationResults
+from src.trajectory import TrajectoryRecorder, VisualModel
 
-def sim_fifo_single_visual(num_periods=100, 
-                          num_loading_forklifts=3, 
-                          num_unloading_forklifts=2, 
-                          mean_trips_per_period=10,    
-                          std_trips_per_period=2,      
-                          mean_items_per_trip=5,       
-                          std_items_per_trip=1,        
-                          save_movie=True):
-    # Adjustable parameters
-    area_capacity1 = 92
-    area_capacity2 = 166
-    area_capacity3 = 170
-    area_capacity4 = 226
-    
-    # Initialize storage areas (1,2,3,4) with capacity
-    areas = {
-        1: {'items': [], 'capacity': area_capacity1, 'pos': (0.2, 0.5)},
-        2: {'items': [], 'capacity': area_capacity2, 'pos': (0.4, 0.5)},
-        3: {'items': [], 'capacity': area_capacity3, 'pos': (0.6, 0.5)},
-        4: {'items': [], 'capacity': area_capacity4, 'pos': (0.8, 0.5)}
-    }
-    
-    # Initialize figure
-    fig = plt.figure(figsize=(15, 10))
+def _setup_figure(fig, areas, num_periods, num_loading_forklifts, num_unloading_forklifts,
+                  mean_trips_per_period, mean_items_per_trip, window=None):
+    """Create every static and animated artist of the storage animation on fig."""
+    # With a sliding window the history axes only ever span `window` periods
+    if window is not None:
+        num_periods = window
     gs = fig.add_gridspec(4, 1, height_ratios=[3, 1, 1, 1])
     ax1 = fig.add_subplot(gs[0])
     ax2 = fig.add_subplot(gs[1])
@@ -76,7 +65,7 @@ def sim_fifo_single_visual(num_periods=100,
             fill=True,
             facecolor='green',
             alpha=0.3,
-            label=f'Area {area_num}'  # Add label to identify the area
+            label=area_data.get('name', f'Area {area_num}')  # Add label to identify the area
         )
         ax1.add_patch(rect)
         storage_patches.append(rect)
@@ -87,18 +76,10 @@ def sim_fifo_single_visual(num_periods=100,
         
         # Create and store the text label
         text = ax1.text(area_data['pos'][0]-0.05, area_data['pos'][1]-0.15, 
-                       f'Area {area_num}\n0/{area_data["capacity"]}\n(0%)', 
+                       f'{area_data.get("name", f"Area {area_num}")}\n0/{area_data["capacity"]}\n(0%)', 
                        ha='center')
         text_labels.append(text)
     
-    # Initialize tracking
-    occupancy_history = {i: [] for i in range(1, 5)}
-    loading_utilization_history = []
-    unloading_utilization_history = []
-    period_history = []
-    trips_history = []
-    items_per_trip_history = []
-    
     # Create multiple forklift representations
     loading_forklifts = []
     unloading_forklifts = []
@@ -115,187 +96,236 @@ def sim_fifo_single_visual(num_periods=100,
     
     # Initialize lines for graphs with proper labels
     occupancy_lines = []
-    for area_num in range(1, 5):
-        line, = ax2.plot([], [], label=f'Area {area_num}')
+    for area_num, area_data in areas.items():
+        line, = ax2.plot([], [], label=area_data.get('name', f'Area {area_num}'))
         occupancy_lines.append(line)
     
     loading_util_line, = ax3.plot([], [], 'b-', label='Loading Forklifts')
     unloading_util_line, = ax3.plot([], [], 'r-', label='Unloading Forklifts')
     trips_line, = ax4.plot([], [], 'g-', label='Trips per Period')
     items_line, = ax4.plot([], [], 'y-', label='Items per Trip')
+    
+    # Status box, reused by every frame
+    status_text = ax1.text(0.02, 0.98, '',
+                           transform=ax1.transAxes,
+                           verticalalignment='top',
+                           bbox=dict(boxstyle='round',
+                                     facecolor='white',
+                                     alpha=0.8))
+
+    return {
+        'fig': fig, 'axes': (ax1, ax2, ax3, ax4),
+        'storage_patches': storage_patches, 'text_labels': text_labels,
+        'loading_forklifts': loading_forklifts, 'unloading_forklifts': unloading_forklifts,
+        'occupancy_lines': occupancy_lines,
+        'loading_util_line': loading_util_line, 'unloading_util_line': unloading_util_line,
+        'trips_line': trips_line, 'items_line': items_line,
+        'status_text': status_text
+    }
+
+def _draw_forklifts(forklifts, targets, positions, y):
+    # One set_data per forklift: drawn on the path to its target area (0 = idle)
+    for forklift, area_num in zip(forklifts, targets):
+        if area_num:
+            forklift.set_data([0.1, positions[area_num - 1][0]], [y, y])
+        else:
+            forklift.set_data([], [])
+
+def _history_window(artists, frame, window):
+    # Slice of the history to draw; with a sliding window the x-axes follow it
+    if window is None:
+        return slice(0, frame + 1)
+    start = max(0, frame + 1 - window)
+    for ax in artists['axes'][1:]:
+        ax.set_xlim(start, start + window)
+    return slice(start, frame + 1)
+
+def _trajectory_renderer(artists, trajectory, window=None):
+    """Return an update(frame) callback that draws frames of a precomputed trajectory."""
+    params = trajectory['params']
+    positions = [area['pos'] for area in params['areas'].values()]
+    names = [area.get('name', f'Area {num}') for num, area in params['areas'].items()]
+    capacities = np.array([area['capacity'] for area in params['areas'].values()])
+    periods = np.arange(params['num_periods'])
+    occupancy = trajectory['occupancy']
+    occupancy_pct = occupancy / capacities * 100
+    status_text = artists['status_text']
 
     def update(frame):
-        # Generate random trips and items per trip
-        trips_per_period = max(1, int(np.random.normal(mean_trips_per_period, std_trips_per_period)))
-        items_per_trip = max(1, int(np.random.normal(mean_items_per_trip, std_items_per_trip)))
-        
-        # Remove loading capacity limitation
-        loading_capacity_per_period = float('inf')  # No limitation for loading
-        unloading_capacity_per_period = num_unloading_forklifts * trips_per_period * items_per_trip
-        
-        # Use Poisson distribution with mean of 22 ULDs per hour
-        new_items = np.random.poisson(22)
-        items_to_remove = np.random.poisson(20)
-        
-        active_loading_areas = []
-        active_unloading_areas = []
-        
-        def find_next_available_area():
-            for area_num in range(1, 5):
-                if len(areas[area_num]['items']) < areas[area_num]['capacity']:
-                    return area_num
-            return None
-        
-        # Process removals - Modified to handle multiple areas with delays
-        removed_items = 0
-        if items_to_remove > 0:
-            # Add random delays for unloading
-            delay_probability = 0.3  # 30% chance of delay for each unloading operation
-            processing_efficiency = np.random.uniform(0.6, 1.0)  # Random efficiency between 60-100%
-            
-            # Adjust items_to_remove based on processing efficiency
-            actual_items_to_remove = int(items_to_remove * processing_efficiency)
-            
-            # Calculate items to remove from each non-empty area
-            for area_num in range(1, 5):
-                if len(areas[area_num]['items']) > 0:
-                    # Apply random delays
-                    if np.random.random() < delay_probability:
-                        # Skip this area this period due to delay
-                        continue
-                        
-                    area_items_to_remove = min(
-                        actual_items_to_remove - removed_items,
-                        len(areas[area_num]['items']),
-                        int(unloading_capacity_per_period * processing_efficiency) // 4
-                    )
-                    
-                    # Remove items and update visualization
-                    for i in range(area_items_to_remove):
-                        areas[area_num]['items'].pop(0)
-                        removed_items += 1
-                        
-                        forklift_index = (removed_items // items_per_trip) % num_unloading_forklifts
-                        if forklift_index < len(unloading_forklifts):
-                            unloading_forklifts[forklift_index].set_data(
-                                [0.1, areas[area_num]['pos'][0]], 
-                                [0.2, 0.2]
-                            )
-                            if area_num not in active_unloading_areas:
-                                active_unloading_areas.append(area_num)
-                    
-                    if removed_items >= actual_items_to_remove:
-                        break
-        
-        # Process additions - Modified to ignore forklift capacity
-        added_items = 0
-        if new_items > 0:
-            # Distribute new items across available areas without forklift limitations
-            for area_num in range(1, 5):
-                if len(areas[area_num]['items']) < areas[area_num]['capacity']:
-                    space_available = areas[area_num]['capacity'] - len(areas[area_num]['items'])
-                    area_items_to_add = min(
-                        new_items - added_items,
-                        space_available
-                        # Removed the loading_capacity_per_period limitation
-                    )
-                    
-                    # Add items and update visualization
-                    for i in range(area_items_to_add):
-                        areas[area_num]['items'].append({
-                            'timestamp': frame,
-                            'item_id': f"item_{frame}_{added_items}"
-                        })
-                        added_items += 1
-                        
-                        # Update forklift visualization (just for display)
-                        forklift_index = (added_items % num_loading_forklifts)
-                        if forklift_index < len(loading_forklifts):
-                            loading_forklifts[forklift_index].set_data(
-                                [0.1, areas[area_num]['pos'][0]], 
-                                [0.8, 0.8]
-                            )
-                            if area_num not in active_loading_areas:
-                                active_loading_areas.append(area_num)
-                    
-                    if added_items >= new_items:
-                        break
-
-        # Reset inactive forklifts
-        for i in range(num_loading_forklifts):
-            if i >= len(active_loading_areas):
-                loading_forklifts[i].set_data([], [])
-
-        for i in range(num_unloading_forklifts):
-            if i >= len(active_unloading_areas):
-                unloading_forklifts[i].set_data([], [])
+        # A live recorder fills rows as the model advances, so refresh this frame's row
+        occupancy_pct[frame] = occupancy[frame] / capacities * 100
+        _draw_forklifts(artists['loading_forklifts'], trajectory['loading_forklifts'][frame],
+                        positions, 0.8)
+        _draw_forklifts(artists['unloading_forklifts'], trajectory['unloading_forklifts'][frame],
+                        positions, 0.2)
 
         # Update area visualizations
-        for area_num, area_data in areas.items():
-            occupancy = len(area_data['items']) / area_data['capacity']
-            
-            # Update rectangle color
-            storage_patches[area_num-1].set_facecolor(plt.cm.RdYlGn(max(0, 1 - occupancy)))
-            storage_patches[area_num-1].set_alpha(0.5)
-            
-            # Update text label
-            text_labels[area_num-1].set_text(
-                f'Area {area_num}\n{len(area_data["items"])}/{area_data["capacity"]}\n({occupancy*100:.1f}%)'
-            )
-            
-            # Update occupancy history
-            occupancy_history[area_num].append(occupancy * 100)
-        
-        # Calculate and update utilization metrics
-        loading_util = (len(active_loading_areas) / num_loading_forklifts) * 100
-        unloading_util = (len(active_unloading_areas) / num_unloading_forklifts) * 100
-        
-        loading_utilization_history.append(loading_util)
-        unloading_utilization_history.append(unloading_util)
-        period_history.append(frame)
-        trips_history.append(trips_per_period)
-        items_per_trip_history.append(items_per_trip)
-        
-        # Update all graph lines
-        for i, line in enumerate(occupancy_lines):
-            line.set_data(period_history, occupancy_history[i+1])
-        
-        loading_util_line.set_data(period_history, loading_utilization_history)
-        unloading_util_line.set_data(period_history, unloading_utilization_history)
-        trips_line.set_data(period_history, trips_history)
-        items_line.set_data(period_history, items_per_trip_history)
-        
-        # Update status text
-        status_text = (f'Period: {frame}\n'
-                      f'New Items: {new_items}\n'
-                      f'Added: {added_items} (Capacity: {loading_capacity_per_period})\n'
-                      f'Removals: {items_to_remove}\n'
-                      f'Removed: {removed_items} (Capacity: {unloading_capacity_per_period})\n'
-                      f'Active Area: {find_next_available_area()}\n'
-                      f'Trips this period: {trips_per_period} (Mean: {mean_trips_per_period})\n'
-                      f'Items per trip: {items_per_trip} (Mean: {mean_items_per_trip})')
-        
-        if hasattr(update, 'status_text'):
-            update.status_text.remove()
-        update.status_text = ax1.text(0.02, 0.98, status_text,
-                                    transform=ax1.transAxes,
-                                    verticalalignment='top',
-                                    bbox=dict(boxstyle='round',
-                                            facecolor='white',
-                                            alpha=0.8))
-        
-        return (loading_forklifts + unloading_forklifts + storage_patches + 
-                occupancy_lines + [loading_util_line, unloading_util_line] + 
-                text_labels + [update.status_text] + [trips_line, items_line])
+        for i, (patch, label) in enumerate(zip(artists['storage_patches'], artists['text_labels'])):
+            occupancy_rate = occupancy_pct[frame, i] / 100
+            patch.set_facecolor(plt.cm.RdYlGn(max(0, 1 - occupancy_rate)))
+            patch.set_alpha(0.5)
+            label.set_text(f'{names[i]}\n{occupancy[frame, i]}/{capacities[i]}\n'
+                           f'({occupancy_rate*100:.1f}%)')
+
+        # History lines are views into the precomputed arrays
+        shown = _history_window(artists, frame, window)
+        for i, line in enumerate(artists['occupancy_lines']):
+            line.set_data(periods[shown], occupancy_pct[shown, i])
+        artists['loading_util_line'].set_data(periods[shown], trajectory['loading_util'][shown])
+        artists['unloading_util_line'].set_data(periods[shown], trajectory['unloading_util'][shown])
+        artists['trips_line'].set_data(periods[shown], trajectory['trips'][shown])
+        artists['items_line'].set_data(periods[shown], trajectory['items_per_trip'][shown])
+
+        status_text.set_text(
+            f'Period: {frame}\n'
+            f'New Items: {trajectory["new_items"][frame]}\n'
+            f'Added: {trajectory["added"][frame].sum()} (Capacity: inf)\n'
+            f'Removals: {trajectory["items_to_remove"][frame]}\n'
+            f'Removed: {trajectory["removed"][frame].sum()} '
+            f'(Capacity: {trajectory["unloading_capacity"][frame]})\n'
+            f'Active Area: {trajectory["next_area"][frame] or None}\n'
+            f'Trips this period: {trajectory["trips"][frame]} '
+            f'(Mean: {params["mean_trips_per_period"]})\n'
+            f'Items per trip: {trajectory["items_per_trip"][frame]} '
+            f'(Mean: {params["mean_items_per_trip"]})')
+
+        return (artists['loading_forklifts'] + artists['unloading_forklifts'] +
+                artists['storage_patches'] + artists['occupancy_lines'] +
+                [artists['loading_util_line'], artists['unloading_util_line']] +
+                artists['text_labels'] + [status_text] +
+                [artists['trips_line'], artists['items_line']])
+
+    return update
 
+def _render_block(trajectory, frames, directory, dpi, window=None):
+    # Worker: draw a contiguous block of frames to PNG files on a private Agg canvas
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    params = trajectory['params']
+    fig = Figure(figsize=(15, 10))
+    FigureCanvasAgg(fig)
+    artists = _setup_figure(fig, params['areas'], params['num_periods'],
+                            params['num_loading_forklifts'], params['num_unloading_forklifts'],
+                            params['mean_trips_per_period'], params['mean_items_per_trip'],
+                            window)
+    update = _trajectory_renderer(artists, trajectory, window)
+    paths = []
+    for frame in frames:
+        update(frame)
+        path = os.path.join(directory, f'frame_{frame:06d}.png')
+        fig.savefig(path, dpi=dpi)
+        paths.append(path)
+    return paths
+
+def render_trajectory(trajectory, filename='storage_simulation.gif', n_jobs=None, fps=15, dpi=100,
+                      window=None):
+    """Render a precomputed trajectory to images using a pool of worker processes.
+
+    The frame range is split into one contiguous block per worker. A ``.gif``
+    filename stitches the frames into an animation; any other filename is
+    treated as a directory that receives the individual PNG frames.
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    # The FIFO contents are not needed for drawing, so keep them out of the pickles
+    payload = {key: value for key, value in trajectory.items() if key != 'areas'}
+    num_frames = payload['params']['num_periods']
+    blocks = [block for block in np.array_split(np.arange(num_frames), n_jobs) if len(block)]
+
+    stitch = str(filename).endswith('.gif')
+    directory = tempfile.mkdtemp() if stitch else filename
+    os.makedirs(directory, exist_ok=True)
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(_render_block, payload, block.tolist(), directory, dpi, window)
+                       for block in blocks]
+            paths = [path for future in futures for path in future.result()]
+
+        if not stitch:
+            return paths
+
+        from PIL import Image
+
+        def later_frames():
+            # One frame file open at a time, however long the movie
+            for path in paths[1:]:
+                with Image.open(path) as frame:
+                    frame.load()
+                    yield frame
+
+        with Image.open(paths[0]) as first:
+            first.save(filename, save_all=True, append_images=later_frames(),
+                       duration=int(1000 / fps), loop=0)
+        print(f"Animation saved as '{filename}'")
+        return filename
+    finally:
+        if stitch:
+            shutil.rmtree(directory, ignore_errors=True)
+
+def sim_fifo_single_visual(num_periods=100, 
+                          num_loading_forklifts=3, 
+                          num_unloading_forklifts=2, 
+                          mean_trips_per_period=10,    
+                          std_trips_per_period=2,      
+                          mean_items_per_trip=5,       
+                          std_items_per_trip=1,        
+                          save_movie=True,
+                          trajectory=None,
+                          window=None,
+                          layout=DEFAULT_LAYOUT,
+                          writer=None,
+                          profiler=None):
+    # Without a precomputed trajectory (see src.trajectory.visual_trajectory) the model
+    # advances one period per frame and a recorder fills the arrays the renderer draws
+    model = None
+    if trajectory is None:
+        model = VisualModel(num_loading_forklifts, num_unloading_forklifts,
+                            mean_trips_per_period, std_trips_per_period,
+                            mean_items_per_trip, std_items_per_trip,
+                            layout=layout, profiler=profiler)
+        recorder = TrajectoryRecorder(num_periods, len(layout), num_loading_forklifts,
+                                      num_unloading_forklifts)
+        model.observers.append(recorder)
+        trajectory = dict(recorder.trajectory, areas=model.areas,
+                          params=model.params(num_periods))
+    params = trajectory['params']
+    areas = trajectory['areas']
+    
+    # Initialize figure
+    fig = plt.figure(figsize=(15, 10))
+    artists = _setup_figure(fig, params['areas'], params['num_periods'],
+                            params['num_loading_forklifts'], params['num_unloading_forklifts'],
+                            params['mean_trips_per_period'], params['mean_items_per_trip'],
+                            window)
+    ax1, ax2, ax3, ax4 = artists['axes']
+    render = _trajectory_renderer(artists, trajectory, window)
+    
+    def update(frame):
+        if profiler is not None:
+            # The time since the previous update returned is spent drawing that frame
+            if profiler.period is not None:
+                profiler.lap('render')
+            profiler.begin(frame)
+        if model is not None:
+            model.step(frame)
+        changed = render(frame)
+        if profiler is not None:
+            profiler.lap('artists')
+        return changed
+    
     # Create animation
+    # A sliding window moves the axis limits, which blitting would not redraw
     anim = animation.FuncAnimation(
-        fig, update, frames=num_periods,
+        fig, update, frames=params['num_periods'],
         interval=200,
-        blit=True
+        blit=window is None
     )
     
-    if save_movie:
+    # A custom writer (e.g. one that only draws frames, for benchmarks) replaces the GIF
+    if writer is not None:
+        anim.save('storage_simulation.gif', writer=writer)
+    elif save_movie:
         writer = animation.PillowWriter(
             fps=15,
             metadata=dict(artist='Me'),
@@ -314,17 +344,130 @@ def sim_fifo_single_visual(num_periods=100,
     
     return areas
 
-def plot_multiple_simulations(results, num_sims=5):
-    """Plot results from multiple simulations."""
+def plot_multiple_simulations(results, num_sims=5, layout=DEFAULT_LAYOUT, mode='lines'):
+    """Plot results from multiple simulations (a simFIFO DataFrame or SimulationResults).
+
+    mode='lines' draws every area of the first num_sims simulations. For
+    many simulations use the aggregate modes: 'fan' (plot_quantile_fan),
+    'density' (plot_density) or 'spaghetti' (plot_spaghetti, num_sims
+    sampled runs).
+    """
+    results = _as_results(results, layout)
+    if mode == 'fan':
+        return plot_quantile_fan(results, layout)
+    if mode == 'density':
+        return plot_density(results, layout)
+    if mode == 'spaghetti':
+        return plot_spaghetti(results, num_sims, layout)
+    if mode != 'lines':
+        raise ValueError(f"unknown plot mode {mode!r}")
     plt.figure(figsize=(12, 6))
     for sim in range(num_sims):
-        single_sim = results[results['simulation'] == sim]
-        for area in range(1, 5):
-            plt.plot(single_sim[f'area{area}_occupancy'], 
-                    label=f'Simulation {sim} Area {area}')
+        single_sim = results.simulation(sim)
+        for area, name in enumerate(layout.names):
+            plt.plot(single_sim[:, area], 
+                    label=f'Simulation {sim} {name}')
     
     plt.xlabel('Period')
     plt.ylabel('Occupancy')
     plt.legend()
     plt.title('Storage Area Occupancy Over Time for Multiple Simulations')
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def _as_results(results, layout):
+    if isinstance(results, SimulationResults):
+        return results
+    return SimulationResults.from_frame(results, layout.capacities, layout.columns)
+
+def _area_axes(layout, figsize=(12, 8)):
+    fig, axes = plt.subplots(len(layout), 1, figsize=figsize, sharex=True, squeeze=False)
+    return fig, axes[:, 0]
+
+def occupancy_histogram(occupancy, capacity, max_columns=1000):
+    """(period bins x occupancy values) counts for one area's (simulations x periods) occupancy.
+
+    Periods are grouped into at most max_columns equal bins, so the size of
+    the result depends on the plot resolution, not on the number of
+    simulations. Returns the counts and the first period of each bin.
+    """
+    num_periods = occupancy.shape[1]
+    width = max(1, -(-num_periods // max_columns))
+    bins = np.arange(num_periods) // width
+    num_bins = bins[-1] + 1
+    values = capacity + 1
+    flat = bins[None, :] * values + np.asarray(occupancy, dtype=np.int64)
+    counts = np.bincount(flat.ravel(), minlength=num_bins * values)
+    return counts.reshape(num_bins, values), np.arange(num_bins) * width
+
+def plot_quantile_fan(results, layout=DEFAULT_LAYOUT, bands=((0.05, 0.95), (0.25, 0.75))):
+    """Per-area median occupancy with shaded quantile bands across simulations."""
+    results = _as_results(results, layout)
+    quantiles = sorted({q for band in bands for q in band} | {0.5})
+    values = dict(zip(quantiles, results.quantile(quantiles, 'simulation')))
+    periods = np.arange(results.num_periods)
+    fig, axes = _area_axes(layout)
+    for area, (ax, name) in enumerate(zip(axes, layout.names)):
+        for low, high in bands:
+            ax.fill_between(periods, values[low][:, area], values[high][:, area], alpha=0.25,
+                            color='tab:blue', linewidth=0,
+                            label=f'{low:.0%}-{high:.0%}')
+        ax.plot(periods, values[0.5][:, area], color='tab:blue', label='median')
+        ax.set_ylim(0, layout.capacities[area] * 1.05)
+        ax.set_ylabel(name)
+    axes[0].legend(loc='upper right')
+    axes[-1].set_xlabel('Period')
+    fig.suptitle(f'Occupancy quantiles over {results.num_simulations} simulations')
+    plt.show()
+    return fig
+
+def plot_density(results, layout=DEFAULT_LAYOUT, max_columns=1000, cmap='viridis'):
+    """Per-area heatmap of the share of simulations at each occupancy in each period.
+
+    The colour scale is logarithmic, so rare paths stay visible next to the
+    full areas most simulations settle in.
+    """
+    from matplotlib.colors import LogNorm
+
+    results = _as_results(results, layout)
+    norm = LogNorm(vmin=1 / results.num_simulations, vmax=1)
+    fig, axes = _area_axes(layout)
+    for area, (ax, name) in enumerate(zip(axes, layout.names)):
+        capacity = layout.capacities[area]
+        counts, starts = occupancy_histogram(results.area(area), capacity, max_columns)
+        share = np.ma.masked_equal(counts / counts.sum(axis=1, keepdims=True), 0)
+        width = starts[1] if len(starts) > 1 else 1
+        image = ax.imshow(share.T, origin='lower', aspect='auto', cmap=cmap, norm=norm,
+                          interpolation='nearest',
+                          extent=(0, len(starts) * width, -0.5, capacity + 0.5))
+        ax.set_ylim(-0.5, capacity * 1.05)
+        ax.set_ylabel(name)
+    fig.colorbar(image, ax=list(axes), label='Share of simulations')
+    axes[-1].set_xlabel('Period')
+    fig.suptitle(f'Occupancy density over {results.num_simulations} simulations')
+    plt.show()
+    return fig
+
+def plot_spaghetti(results, num_sims=100, layout=DEFAULT_LAYOUT, seed=None, alpha=0.2):
+    """Sampled trajectories, drawn as one LineCollection per area."""
+    from matplotlib.collections import LineCollection
+
+    results = _as_results(results, layout)
+    rng = np.random.default_rng(seed)
+    num_sims = min(num_sims, results.num_simulations)
+    sample = np.sort(rng.choice(results.num_simulations, num_sims, replace=False))
+    periods = np.arange(results.num_periods)
+    fig, axes = _area_axes(layout)
+    for area, (ax, name) in enumerate(zip(axes, layout.names)):
+        # (lines x points x 2) vertices
+        segments = np.empty((num_sims, results.num_periods, 2))
+        segments[:, :, 0] = periods
+        segments[:, :, 1] = results.area(area)[sample]
+        ax.add_collection(LineCollection(segments, colors='tab:blue', alpha=alpha,
+                                         linewidths=0.8))
+        ax.set_xlim(0, max(results.num_periods - 1, 1))
+        ax.set_ylim(0, layout.capacities[area] * 1.05)
+        ax.set_ylabel(name)
+    axes[-1].set_xlabel('Period')
+    fig.suptitle(f'{num_sims} of {results.num_simulations} simulations')
+    plt.show()
+    return fig